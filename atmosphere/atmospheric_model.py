@@ -88,6 +88,18 @@ def extinction_mag(alt_deg: float, bv_color: float = 0.6,
     return k * X
 
 
+def extinction_mag_array(alt_deg: float, bv_color: np.ndarray,
+                         altitude_m: float = 0.0) -> np.ndarray:
+    """
+    extinction_mag for many stars at one altitude: same model, with the
+    B-V interpolation done on the whole array.
+    """
+    pressure_factor = math.exp(-altitude_m / 8500.0)
+    t = np.clip((np.asarray(bv_color, dtype=np.float64) + 0.5) / 2.5, 0.0, 1.0)
+    k = _K_EXT['B'] * (1 - t) + _K_EXT['R'] * t
+    return k * (pressure_factor * airmass(alt_deg))
+
+
 # ---------------------------------------------------------------------------
 # Rayleigh sky background
 # ---------------------------------------------------------------------------
@@ -298,6 +310,10 @@ class AtmosphericState:
         """Extinction magnitude loss for star at this altitude."""
         return extinction_mag(alt_deg, bv_color, self.observer.altitude_m)
 
+    def extinction_at_array(self, alt_deg: float, bv_color: np.ndarray) -> np.ndarray:
+        """Extinction magnitude loss for many stars at one altitude."""
+        return extinction_mag_array(alt_deg, bv_color, self.observer.altitude_m)
+
     def sky_background_field(self, H: int, W: int,
                                exposure_s: float = 1.0) -> np.ndarray:
         """
@@ -335,7 +351,8 @@ class AtmosphericState:
             np.full((H, W), b_bg, dtype=np.float32) * gradient,
         ], axis=-1)
 
-        return np.clip(field, 0, None).astype(np.float32)
+        np.clip(field, 0, None, out=field)
+        return field.astype(np.float32, copy=False)
 
 
 class AtmosphericModel:
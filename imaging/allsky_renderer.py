@@ -13,7 +13,7 @@ from typing import Optional, Tuple
 from imaging.sky_renderer import mag_to_flux, bv_to_rgb
 from imaging.celestial_bodies import (draw_sun, draw_moon,
                                        draw_atmospheric_glow)
-from imaging.solar_bodies_renderer import render_solar_bodies, render_planet
+from imaging.solar_bodies_renderer import render_solar_bodies, render_planets
 from universe.orbital_body import equatorial_to_altaz
 from atmosphere.cloud_layer import CloudLayer
 
@@ -125,8 +125,11 @@ def build_allsky_background(size: int, atm_state, exposure_s: float = 1.0,
     B = (bg_b * alt_gradient + sun_glow * bg_b * 0.05 + sky_noise
          + airglow * bg_b * 0.15) * inside
 
-    return np.stack([np.clip(R, 0, None), np.clip(G, 0, None), np.clip(B, 0, None)],
-                    axis=-1).astype(np.float32)
+    # Assemble the float32 field once and clip it in place (the planes
+    # are already float32, so no further cast or copy is needed)
+    field = np.stack([R, G, B], axis=-1).astype(np.float32, copy=False)
+    np.maximum(field, 0.0, out=field)
+    return field
 
 def _apply_cloud_overlay(field: np.ndarray, cloud_mask: np.ndarray) -> None:
     """
@@ -182,7 +185,7 @@ class AllSkyRenderer:
           sun_body     : OrbitalBody with is_sun=True  (already update_position called)
           moon_body    : OrbitalBody with is_moon=True (already update_position called)
           solar_bodies : lista completa (Sole+Luna+pianeti+minori), usata per
-                         render_planet su tutti i corpi non-Sole non-Luna
+                         render_planets su tutti i corpi non-Sole non-Luna
         """
         S      = self.render_size
         cx = cy = S / 2.0
@@ -243,14 +246,10 @@ class AllSkyRenderer:
         # ── Planets & minor bodies ───────────────────────────────────────
         if solar_bodies is not None:
             gm = _gain_mult(gain_sw)
-            for body in solar_bodies:
-                if body.is_sun or body.is_moon:
-                    continue
-                try:
-                    render_planet(field, body, cx, cy, radius,
-                                  exposure_s * gm)
-                except Exception:
-                    pass
+            render_planets(field,
+                           [b for b in solar_bodies
+                            if not (b.is_sun or b.is_moon)],
+                           cx, cy, radius, exposure_s * gm)
 
         # ── Cloud overlay (Sprint 14b) ────────────────────────────────────
         if self._cloud.coverage > 0.01:
@@ -87,10 +87,11 @@ class Frame:
         Initialize frame
         
         Args:
-            data: Image data as float32 numpy array
+            data: Image data as float32 numpy array (held as is, not
+                copied, when it already is float32)
             metadata: Frame metadata
         """
-        self.data = data.astype(np.float32)
+        self.data = data.astype(np.float32, copy=False)
         self.meta = metadata
         
         # Compute basic statistics if not already done
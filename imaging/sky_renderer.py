@@ -14,10 +14,27 @@ fed into the Camera simulation for realistic noise.
 """
 
 from __future__ import annotations
+import functools
 import math
 import numpy as np
 from typing import Optional, Tuple, List, TYPE_CHECKING
 
+from imaging.star_splat import (HAS_CV2, HAS_NUMBA, splat_stamps, splat_impulses,
+                                splat_deltas)
+
+if HAS_NUMBA:
+    import numba
+
+try:
+    import numexpr
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+# numexpr only beats NumPy's vectorised float32 exp/pow when it can
+# spread the work over several threads.
+_USE_NUMEXPR = HAS_NUMEXPR and numexpr.nthreads > 1
+
 if TYPE_CHECKING:
     from universe.space_object import SpaceObject
 
@@ -76,6 +93,26 @@ def mag_to_flux(mag: float, aperture_cm: float, exposure_s: float,
     return max(0.0, VEGA_FLUX_V * (10.0 ** (-0.4 * mag)) * area_cm2 * exposure_s)
 
 
+# 10^(-0.4 m) = exp(m * _POGSON_LN)
+_POGSON_LN = -0.4 * math.log(10.0)
+
+
+def mag_to_flux_array(mag: np.ndarray, aperture_cm: float,
+                      exposure_s: float) -> np.ndarray:
+    """
+    Vectorised mag_to_flux over an array of magnitudes.
+    The whole calibration is folded into one exp: exp(m*c + ln k).
+    Evaluated and returned in float32, the dtype the splat kernels
+    consume (relative error ~1e-6, far below photon noise).
+    """
+    k = VEGA_FLUX_V * math.pi * (aperture_cm / 2.0) ** 2 * exposure_s
+    if k <= 0.0:
+        return np.zeros(np.shape(mag), dtype=np.float32)
+    flux = np.asarray(mag, dtype=np.float32) * np.float32(_POGSON_LN)
+    flux += np.float32(math.log(k))
+    return np.exp(flux, out=flux)
+
+
 def sky_photons_per_pixel(sky_mag_arcsec2: float, aperture_cm: float,
                            pixel_scale_arcsec: float, exposure_s: float) -> float:
     """
@@ -138,24 +175,116 @@ def bv_to_rgb(bv: float, desaturate: float = 0.55) -> Tuple[float, float, float]
     return (r, g, b)
 
 
+# Every bv_to_rgb branch is linear in B-V, so the undesaturated colour is
+# exactly piecewise linear between these knots. The two steps in green
+# (at B-V 0 and 0.3) are encoded as a knot pair 1e-9 apart: the left one
+# carries the limit of the lower branch.
+_BV_KNOTS = np.array([-0.4, -1e-9, 0.0, 0.3 - 1e-9, 0.3, 0.7, 1.2, 2.0])
+# Where bv_to_rgb is sampled for each knot (just below each step)
+_BV_KNOT_SAMPLES = (-0.4, -1e-12, 0.0, 0.3 - 1e-12, 0.3, 0.7, 1.2, 2.0)
+_BV_KNOT_RGB = np.array([bv_to_rgb(bv, desaturate=0.0)
+                         for bv in _BV_KNOT_SAMPLES]).T.copy()
+
+
+def bv_to_rgb_array(bv: np.ndarray, desaturate: float = 0.55) -> np.ndarray:
+    """
+    Vectorised bv_to_rgb: branchless linear interpolation over the
+    spectral-class knots (exact, since every branch is linear in B-V).
+
+    Args:
+        bv: Array of B-V indices
+        desaturate: Blend toward white (as in bv_to_rgb)
+
+    Returns:
+        (N, 3) float32 array of (R, G, B) multipliers
+    """
+    bv = np.asarray(bv, dtype=np.float64).ravel()
+    rgb = np.empty((bv.size, 3), dtype=np.float32)
+    for k in range(3):
+        # np.interp clamps outside [-0.4, 2.0] like bv_to_rgb does
+        rgb[:, k] = np.interp(bv, _BV_KNOTS, _BV_KNOT_RGB[k])
+
+    # Desaturate toward white — photographic stars are never saturated LEDs
+    rgb += (1.0 - rgb) * np.float32(desaturate)
+    return rgb
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # PSF (Point Spread Function)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def gaussian_psf(size: int, sigma: float) -> np.ndarray:
+# Magnitude bands for star PSFs: (upper mag bound, sigma factor, half-size).
+# Bright stars use larger sigma to simulate saturation bloom.
+PSF_BANDS = (
+    (0.0,      4.0, 14),
+    (2.0,      2.8, 10),
+    (4.0,      1.9,  8),
+    (6.0,      1.3,  6),
+    (8.0,      1.0,  4),
+    (10.0,     0.9,  3),
+    (math.inf, 0.8,  2),
+)
+# Lower edges for np.digitize: band i covers [edge[i-1], edge[i])
+_PSF_BAND_EDGES = np.array([mag_max for mag_max, _, _ in PSF_BANDS[:-1]])
+
+# Stars fainter than this are batch-rendered (impulses + one blur per band)
+# instead of per-star stamps; they all share a few small Gaussian PSFs.
+FAINT_STAR_MAG = 8.0
+_FAINT_BAND = int(np.searchsorted(_PSF_BAND_EDGES, FAINT_STAR_MAG)) + 1
+
+# A bright band is rendered as a blurred delta map instead of stamps once
+# its stamp work (stars × kernel pixels) exceeds this multiple of the
+# separable-blur work (window area × kernel width). Measured against the
+# JIT stamp splat (≈2.4 ns per stamp pixel): OpenCV blurs at ≈0.4 ns and
+# scipy.ndimage at ≈1.7 ns per pixel-tap.
+DELTA_SPLAT_RATIO = 0.2 if HAS_CV2 else 0.7
+
+# Stars whose brightest PSF pixel would receive fewer photons than this
+# (in every channel) are skipped: invisible after noise and quantisation.
+NEGLIGIBLE_PHOTONS = 1e-3
+
+
+def gaussian_psf(size: int, sigma: float,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Gaussian PSF kernel for star rendering.
     
     Args:
         size: Half-size of kernel (full size = 2*size+1)
         sigma: PSF sigma in pixels
+        out: Optional (2*size+1, 2*size+1) float32 array to write into
+             (e.g. a slice of the PSF bank), avoiding a temporary kernel
     
     Returns:
         Normalized 2D gaussian array
     """
-    y, x = np.ogrid[-size:size+1, -size:size+1]
-    g = np.exp(-(x*x + y*y) / (2.0 * sigma * sigma))
-    return (g / g.sum()).astype(np.float32)
+    # Isotropic gaussian is separable: outer product of two normalised 1D
+    # profiles (2*size+1 exponentials instead of (2*size+1)^2)
+    k = np.arange(-size, size + 1, dtype=np.float64)
+    g = np.exp(-(k * k) / (2.0 * sigma * sigma))
+    g /= g.sum()
+    g = g.astype(np.float32)
+    return np.outer(g, g, out=out)
+
+
+# Airy profile (2*J1(u)/u)^2 is tabulated on a fixed u-grid and linearly
+# interpolated, so airy_psf never evaluates the Bessel function per pixel.
+_AIRY_TABLE_STEP = 30.0 / 4095
+_AIRY_TABLE_BLOCK = 4096
+
+
+@functools.lru_cache(maxsize=8)
+def _airy_table(n_blocks: int) -> np.ndarray:
+    """(2*J1(u)/u)^2 sampled every _AIRY_TABLE_STEP over [0, n_blocks * 30]."""
+    from scipy.special import j1
+    
+    # One extra sample so the last interval can always be interpolated
+    u = np.arange(n_blocks * _AIRY_TABLE_BLOCK + 1) * _AIRY_TABLE_STEP
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = (2 * j1(u) / u) ** 2
+    table[0] = 1.0
+    table.flags.writeable = False
+    return table
 
 
 def airy_psf(size: int, lambda_um: float, aperture_mm: float,
@@ -174,22 +303,28 @@ def airy_psf(size: int, lambda_um: float, aperture_mm: float,
     Returns:
         Normalized 2D Airy pattern
     """
-    from scipy.special import j1
-    
     # Airy radius in pixels = 1.22 * lambda * f/D / pixel_size
     f_ratio = focal_length_mm / aperture_mm
     airy_radius_um = 1.22 * lambda_um * f_ratio
     airy_radius_px = airy_radius_um / pixel_um
     
     y, x = np.ogrid[-size:size+1, -size:size+1]
-    r = np.sqrt(x*x + y*y)
+    u = np.sqrt(x*x + y*y) * (np.pi / airy_radius_px)
     
-    # Avoid division by zero at center
-    with np.errstate(divide='ignore', invalid='ignore'):
-        u = np.pi * r / airy_radius_px
-        pattern = np.where(r == 0, 1.0, (2 * j1(u) / u) ** 2)
+    # Table long enough for the kernel corner (u = 0 maps to 1.0)
+    u_max = float(u[0, 0])
+    n_blocks = int(u_max / (_AIRY_TABLE_BLOCK * _AIRY_TABLE_STEP)) + 1
+    airy_tab = _airy_table(n_blocks)
+    
+    # Uniform grid: linear interpolation by direct indexing
+    t = u / _AIRY_TABLE_STEP
+    i = t.astype(np.intp)
+    t -= i
+    pattern = airy_tab[i] * (1 - t) + airy_tab[i + 1] * t
     
-    return (pattern / pattern.sum()).astype(np.float32)
+    pattern = pattern.astype(np.float32)
+    pattern /= pattern.sum(dtype=np.float64)
+    return pattern
 
 
 def seeing_psf(base_sigma: float, seeing_arcsec: float,
@@ -217,6 +352,182 @@ def seeing_psf(base_sigma: float, seeing_arcsec: float,
 # DSO Renderers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Side of the square blocks DSO profiles are evaluated in, so each
+# block's float32 temporaries stay cache-resident.
+DSO_TILE = 64
+
+# Namespace for evaluating profile expressions with NumPy when numexpr
+# is not installed (numexpr syntax is a subset of Python's).
+_NUMPY_EXPR_NS = {'__builtins__': {}, 'exp': np.exp, 'sqrt': np.sqrt}
+
+
+@functools.lru_cache(maxsize=8)
+def _pixel_coords(n: int) -> np.ndarray:
+    """Read-only float32 pixel coordinates 0..n-1; slice instead of arange."""
+    coords = np.arange(n, dtype=np.float32)
+    coords.flags.writeable = False
+    return coords
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_expr(expr: str):
+    return compile(expr, '<profile>', 'eval')
+
+
+if HAS_NUMBA:
+    # Compiled counterparts of the profile expressions used by
+    # render_nebula: one fused parallel pass that fills
+    # out (the bounding box starting at field pixel x0, y0) and returns
+    # its sum for normalisation. Keep in step with the expressions.
+
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _ring_kernel(out, x0, y0, cx, cy, r0, width, core, r_core):
+        total = 0.0
+        for j in numba.prange(out.shape[0]):
+            dy = np.float32(y0 + j) - cy
+            for i in range(out.shape[1]):
+                dx = np.float32(x0 + i) - cx
+                r = math.sqrt(dx * dx + dy * dy)
+                t = (r - r0) / width
+                c = r / r_core
+                v = math.exp(-t * t) + core * math.exp(-c * c)
+                out[j, i] = v
+                total += v
+        return total
+
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _radial_exp_kernel(out, x0, y0, cx, cy, scale, power):
+        total = 0.0
+        for j in numba.prange(out.shape[0]):
+            dy = np.float32(y0 + j) - cy
+            for i in range(out.shape[1]):
+                dx = np.float32(x0 + i) - cx
+                v = math.exp(-(math.sqrt(dx * dx + dy * dy) / scale) ** power)
+                out[j, i] = v
+                total += v
+        return total
+
+
+def _jit_kernel(name: str, *args):
+    """(kernel, args) for _add_profile_tiled, or None without Numba."""
+    if not HAS_NUMBA:
+        return None
+    return globals()[name], args
+
+
+def _add_profile_tiled(field: np.ndarray, x0: int, x1: int, y0: int, y1: int,
+                       expr: str, consts: dict, total_photons: float,
+                       weight: Optional[np.ndarray] = None,
+                       kernel=None) -> None:
+    """
+    Evaluate a DSO profile over field[y0:y1, x0:x1] and add it to field
+    normalised to total_photons.
+
+    With multi-threaded numexpr the whole expression runs as one fused
+    pass (numexpr already streams it in cache-sized chunks); failing
+    that, multi-threaded Numba runs the profile's compiled kernel, which
+    fuses evaluation and sum in one parallel loop. Single-threaded, NumPy
+    evaluates it block by block over DSO_TILE tiles, which is fastest on
+    one core.
+
+    Args:
+        field: Output array (H, W)
+        x0, x1, y0, y1: Bounding box in field pixels
+        expr: Profile expression in xx, yy (pixel coordinates) and consts
+        consts: Scalar constants used by expr (evaluated as float32)
+        total_photons: Total photon flux
+        weight: Optional (y1-y0, x1-x0) multiplier applied before normalising
+        kernel: Optional (function, args) for a Numba kernel computing the
+                same profile, called as function(out, x0, y0, *args)
+    """
+    local_dict = {k: np.float32(v) for k, v in consts.items()}
+    profile = np.empty((y1 - y0, x1 - x0), dtype=np.float32)
+    # Views into the shared coordinate ramps: no per-box or per-tile arange
+    ys = _pixel_coords(y1)[:, None]
+    xs = _pixel_coords(x1)[None, :]
+    
+    if (kernel is not None and not _USE_NUMEXPR
+            and numba.get_num_threads() > 1):
+        fn, args = kernel
+        profile_sum = fn(profile, x0, y0, *(np.float32(a) for a in args))
+        if weight is not None:
+            profile *= weight
+            profile_sum = profile.sum(dtype=np.float64)
+        if profile_sum > 0:
+            profile *= np.float32(total_photons / profile_sum)
+            field[y0:y1, x0:x1] += profile
+        return
+    
+    if _USE_NUMEXPR:
+        local_dict['yy'] = ys[y0:y1]
+        local_dict['xx'] = xs[:, x0:x1]
+        numexpr.evaluate(expr, local_dict=local_dict, out=profile)
+    else:
+        code = _compile_expr(expr)
+        for ty0 in range(y0, y1, DSO_TILE):
+            ty1 = min(ty0 + DSO_TILE, y1)
+            local_dict['yy'] = ys[ty0:ty1]
+            for tx0 in range(x0, x1, DSO_TILE):
+                tx1 = min(tx0 + DSO_TILE, x1)
+                local_dict['xx'] = xs[:, tx0:tx1]
+                profile[ty0 - y0:ty1 - y0, tx0 - x0:tx1 - x0] = eval(
+                    code, _NUMPY_EXPR_NS, local_dict)
+    
+    if weight is not None:
+        profile *= weight
+    profile_sum = float(profile.sum(dtype=np.float64))
+    if profile_sum > 0:
+        profile *= np.float32(total_photons / profile_sum)
+        field[y0:y1, x0:x1] += profile
+
+
+# Distance from (cx, cy) used by the nebula profiles
+_R_EXPR = "sqrt((xx - cx)**2 + (yy - cy)**2)"
+
+
+# Sérsic profiles as Gaussian mixtures: n -> (components, smallest and
+# largest sigma in units of r_e). Fitted to within ~1e-3 of the total
+# flux out to 9 r_e, beyond the galaxy bounding box.
+_SERSIC_MIXTURES = {1.0: (10, 0.05, 3.0), 4.0: (16, 0.002, 8.0)}
+
+# Floor for the Gaussian exponents: exp(-40) ~ 4e-18, so products of
+# two factors stay normal floats (denormals slow the GEMM badly).
+_MIXTURE_EXP_FLOOR = np.float32(-40.0)
+
+
+@functools.lru_cache(maxsize=None)
+def _sersic_mixture(n: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Amplitudes and 1/sigma^2 (sigma in units of r_e) of the Gaussian
+    mixture approximating exp(-b_n * ((r/r_e)^(1/n) - 1)), fitted once by
+    non-negative least squares on fixed log-spaced widths.
+    """
+    from scipy.optimize import nnls
+    
+    m, s_min, s_max = _SERSIC_MIXTURES[n]
+    b_n = 1.9992 * n - 0.3271
+    u = np.geomspace(1e-5, 9.0, 6000)
+    target = np.exp(-b_n * (u ** (1.0 / n) - 1.0))
+    sigma = np.geomspace(s_min, s_max, m)
+    basis = np.exp(-(u[:, None] / sigma[None, :]) ** 2)
+    # Weight by annulus area so the fit tracks flux rather than peak value
+    w = np.sqrt(u * np.gradient(u))
+    amps, _ = nnls(basis * w[:, None], target * w)
+    
+    amps = amps.astype(np.float32)
+    inv_var = (1.0 / sigma**2).astype(np.float32)
+    amps.flags.writeable = False
+    inv_var.flags.writeable = False
+    return amps, inv_var
+
+
+def _mixture_factors(d2: np.ndarray, inv_var: np.ndarray) -> np.ndarray:
+    """(M, len(d2)) 1D Gaussian factors exp(-d2 / sigma_i^2)."""
+    arg = np.multiply.outer(-inv_var, d2)
+    np.maximum(arg, _MIXTURE_EXP_FLOOR, out=arg)
+    return np.exp(arg, out=arg)
+
+
 def render_galaxy(field: np.ndarray, cx: float, cy: float,
                   total_photons: float, size_px: float,
                   bv: float = 0.8) -> None:
@@ -235,7 +546,6 @@ def render_galaxy(field: np.ndarray, cx: float, cy: float,
     
     # Sérsic index: 4 for elliptical, 1 for spiral
     n = 4.0 if bv > 0.7 else 1.0
-    b_n = 1.9992 * n - 0.3271       # Approximation for b_n
     
     # Bounding box
     extent = int(min(r_e * 5, min(H, W) / 2))
@@ -245,19 +555,42 @@ def render_galaxy(field: np.ndarray, cx: float, cy: float,
     if x0 >= x1 or y0 >= y1:
         return
     
-    yy, xx = np.ogrid[y0:y1, x0:x1]
-    
-    # Elliptical distance (slight elongation for realism)
-    dx = (xx - cx)
-    dy = (yy - cy) * 1.4  # Slight elongation
-    r = np.sqrt(dx*dx + dy*dy)
-    
-    # Sérsic profile
-    profile = np.exp(-b_n * ((r / r_e) ** (1.0 / n) - 1.0))
-    profile_sum = profile.sum()
+    # Sérsic profile on an elliptical distance (slight elongation for
+    # realism), as a sum of M separable Gaussians: with the 1D factors
+    # gy (h, M) and a * gx (M, w) the whole box is one small GEMM, with
+    # no per-pixel transcendental.
+    amps, inv_var = _sersic_mixture(n)
+    dx2 = ((_pixel_coords(x1)[x0:] - np.float32(cx)) * np.float32(1.0 / r_e)) ** 2
+    dy2 = ((_pixel_coords(y1)[y0:] - np.float32(cy)) * np.float32(1.4 / r_e)) ** 2
+    gx = _mixture_factors(dx2, inv_var)
+    gx *= amps[:, None]
+    gy = _mixture_factors(dy2, inv_var)
+    profile = gy.T @ gx
     
+    profile_sum = float(profile.sum(dtype=np.float64))
     if profile_sum > 0:
-        field[y0:y1, x0:x1] += (profile / profile_sum * total_photons).astype(np.float32)
+        profile *= np.float32(total_photons / profile_sum)
+        field[y0:y1, x0:x1] += profile
+
+
+@functools.lru_cache(maxsize=64)
+def _emission_noise(seed: int, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Turbulence multiplier for emission nebulae: clipped N(1, 0.3) field
+    from a seeded RNG. Deterministic per (seed, shape), so cached across
+    frames. Stored read-only as float16: the values lie in [0.1, 3] and
+    only ever multiply a float32 profile, so half precision (~1e-3) is
+    invisible and halves the cache footprint and read traffic.
+    """
+    rng = np.random.default_rng(seed)
+    # Transform the draw in place: no float64 temporaries beyond the draw
+    noise = rng.standard_normal(shape)
+    noise *= 0.3
+    noise += 1.0
+    np.clip(noise, 0.1, 3.0, out=noise)
+    noise = noise.astype(np.float16)
+    noise.setflags(write=False)
+    return noise
 
 
 def render_nebula(field: np.ndarray, cx: float, cy: float,
@@ -280,48 +613,55 @@ def render_nebula(field: np.ndarray, cx: float, cy: float,
     if x0 >= x1 or y0 >= y1:
         return
     
-    yy, xx = np.ogrid[y0:y1, x0:x1]
-    dx = xx - cx
-    dy = yy - cy
-    r = np.sqrt(dx*dx + dy*dy)
+    noise = None
     
     if nebula_type == "planetary":
-        # Ring profile
-        r0 = size_px * 0.6
-        ring_width = max(1.0, size_px * 0.15)
-        profile = np.exp(-((r - r0) / ring_width) ** 2)
-        # Slight central brightening
-        profile += 0.3 * np.exp(-(r / (size_px * 0.2)) ** 2)
+        # Ring profile with slight central brightening
+        expr = f"exp(-(({_R_EXPR} - r0) / width)**2) + core * exp(-({_R_EXPR} / r_core)**2)"
+        consts = dict(r0=size_px * 0.6, width=max(1.0, size_px * 0.15),
+                      core=0.3, r_core=size_px * 0.2)
+        kernel = _jit_kernel('_ring_kernel', cx, cy, consts['r0'], consts['width'],
+                             consts['core'], consts['r_core'])
         
     elif nebula_type == "snr":
         # Thin shell
-        r0 = size_px * 0.85
-        shell_width = max(0.5, size_px * 0.08)
-        profile = np.exp(-((r - r0) / shell_width) ** 2)
+        expr = f"exp(-(({_R_EXPR} - r0) / width)**2)"
+        consts = dict(r0=size_px * 0.85, width=max(0.5, size_px * 0.08))
+        kernel = _jit_kernel('_ring_kernel', cx, cy, consts['r0'], consts['width'],
+                             0.0, 1.0)
         
     elif nebula_type == "emission":
         # Irregular with filaments — use gaussian + noise seed
-        rng = np.random.default_rng(int(cx * 1000 + cy))
-        profile = np.exp(-(r / size_px) ** 1.2)
+        expr = f"exp(-({_R_EXPR} / scale) ** power)"
+        consts = dict(scale=size_px, power=1.2)
+        kernel = _jit_kernel('_radial_exp_kernel', cx, cy, size_px, 1.2)
         # Add turbulence
-        noise = rng.standard_normal(profile.shape) * 0.3 + 1.0
-        noise = np.clip(noise, 0.1, 3.0)
-        profile = profile * noise
+        noise = _emission_noise(int(cx * 1000 + cy), (y1 - y0, x1 - x0))
         
     else:  # reflection, generic
-        profile = np.exp(-(r / (size_px * 0.8)) ** 1.8)
+        expr = f"exp(-({_R_EXPR} / scale) ** power)"
+        consts = dict(scale=size_px * 0.8, power=1.8)
+        kernel = _jit_kernel('_radial_exp_kernel', cx, cy, size_px * 0.8, 1.8)
     
-    profile_sum = profile.sum()
-    if profile_sum > 0:
-        field[y0:y1, x0:x1] += (profile / profile_sum * total_photons).astype(np.float32)
+    consts.update(cx=cx, cy=cy)
+    _add_profile_tiled(field, x0, x1, y0, y1, expr, consts, total_photons,
+                       weight=noise, kernel=kernel)
 
 
-def render_cluster(field: np.ndarray, cx: float, cy: float,
-                   total_photons: float, size_px: float,
-                   is_globular: bool = False) -> None:
-    """Render a star cluster."""
-    H, W = field.shape
-    rng = np.random.default_rng(int(cx * 1000 + cy))
+# Member-star PSF for render_cluster
+_CLUSTER_PSF_SIGMA = 1.2
+_CLUSTER_PSF_SIZE = 4
+
+
+@functools.lru_cache(maxsize=64)
+def _cluster_members(seed: int, is_globular: bool,
+                     size_px: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Member-star offsets (dx, dy) from the cluster centre and flux
+    fractions, drawn from a seeded RNG. Deterministic, so cached across
+    frames.
+    """
+    rng = np.random.default_rng(seed)
     
     if is_globular:
         # Globular: concentrated King profile
@@ -338,27 +678,43 @@ def render_cluster(field: np.ndarray, cx: float, cy: float,
         radii = np.abs(rng.normal(0, sigma, n_stars))
         angles = rng.uniform(0, 2*math.pi, n_stars)
     
-    xs = cx + radii * np.cos(angles)
-    ys = cy + radii * np.sin(angles)
-    brightnesses = rng.pareto(2.0, n_stars) + 1.0
-    brightnesses = (brightnesses / brightnesses.sum()) * total_photons
-    
-    sigma_psf = 1.2
-    size_k = 4
-    kernel = gaussian_psf(size_k, sigma_psf)
-    
-    for x, y, b in zip(xs, ys, brightnesses):
-        ix, iy = int(round(x)), int(round(y))
-        y0 = max(0, iy - size_k)
-        y1 = min(H, iy + size_k + 1)
-        x0 = max(0, ix - size_k)
-        x1 = min(W, ix + size_k + 1)
-        ky0 = size_k - (iy - y0)
-        ky1 = ky0 + (y1 - y0)
-        kx0 = size_k - (ix - x0)
-        kx1 = kx0 + (x1 - x0)
-        if y0 < y1 and x0 < x1:
-            field[y0:y1, x0:x1] += (kernel[ky0:ky1, kx0:kx1] * b).astype(np.float32)
+    dx = radii * np.cos(angles)
+    dy = radii * np.sin(angles)
+    frac = rng.pareto(2.0, n_stars) + 1.0
+    frac /= frac.sum()
+    for a in (dx, dy, frac):
+        a.setflags(write=False)
+    return dx, dy, frac
+
+
+def render_cluster(field: np.ndarray, cx: float, cy: float,
+                   total_photons: float, size_px: float,
+                   is_globular: bool = False) -> None:
+    """
+    Render a star cluster.
+    
+    All members share one PSF, so they are deposited as impulses and
+    blurred in a single pass (see star_splat.splat_impulses).
+    """
+    dx, dy, frac = _cluster_members(int(cx * 1000 + cy), bool(is_globular),
+                                    float(size_px))
+    splat_impulses((field,), cx + dx, cy + dy, (frac * total_photons)[:, None],
+                   _CLUSTER_PSF_SIGMA, _CLUSTER_PSF_SIZE)
+
+
+# Rec.601 luma weights for collapsing an RGB sky to mono
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _add_tinted(fields, lum: np.ndarray, tint) -> None:
+    """
+    fields[c] += lum * tint[c] for each channel, through one reusable
+    float32 scratch buffer instead of a fresh temporary per channel.
+    """
+    scratch = np.empty_like(lum, dtype=np.float32)
+    for fld, t in zip(fields, tint):
+        np.multiply(lum, np.float32(t), out=scratch)
+        fld += scratch
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -432,31 +788,40 @@ class SkyRenderer:
         min_sigma = max(1.2, seeing_arcsec / self.pixel_scale / 2.355)
         self.psf_sigma = max(min_sigma, self.psf_sigma)
         
-        # PSF kernel cache
+        # PSF bank cache, keyed by psf_sigma (see _get_psf_bank)
         self._psf_cache = {}
+        self._get_psf_bank()
+        
+        # Sky-glow shape cache, keyed by (W, H, gradient strength)
+        self._sky_pattern_cache = {}
     
-    def _get_psf(self, mag: float) -> Tuple[np.ndarray, int]:
+    def _get_psf_bank(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        PSF kernel for a star of given magnitude.
-
-        Bright stars use larger sigma to simulate saturation bloom and the
-        fact that their core contribution spreads beyond the Airy disk.
-        This prevents single-pixel white dots for bright objects.
+        All band PSFs as one (n_bands, K, K) float32 array, each kernel
+        centred and zero-padded to the largest size, plus the half-size
+        of every band. Built once per psf_sigma; stars pick their kernel
+        by band index (np.digitize of magnitude over _PSF_BAND_EDGES).
         """
-        s = self.psf_sigma
-        if   mag < 0:   sigma, size = s * 4.0, 14
-        elif mag < 2:   sigma, size = s * 2.8, 10
-        elif mag < 4:   sigma, size = s * 1.9,  8
-        elif mag < 6:   sigma, size = s * 1.3,  6
-        elif mag < 8:   sigma, size = s * 1.0,  4
-        elif mag < 10:  sigma, size = s * 0.9,  3
-        else:           sigma, size = s * 0.8,  2
-
-        key = round(sigma, 2)
+        key = round(self.psf_sigma, 4)
         if key not in self._psf_cache:
-            self._psf_cache[key] = (gaussian_psf(size, sigma), size)
+            s = self.psf_sigma
+            max_size = max(size for _, _, size in PSF_BANDS)
+            bank = np.zeros((len(PSF_BANDS), 2*max_size + 1, 2*max_size + 1),
+                            dtype=np.float32)
+            sizes = np.empty(len(PSF_BANDS), dtype=np.int64)
+            for i, (_, factor, size) in enumerate(PSF_BANDS):
+                o = max_size - size
+                gaussian_psf(size, s * factor,
+                             out=bank[i, o:o + 2*size + 1, o:o + 2*size + 1])
+                sizes[i] = size
+            # Shared by every frame and handed straight to the splat
+            # kernels: keep it C-contiguous and guard it against writes
+            assert bank.flags.c_contiguous
+            bank.setflags(write=False)
+            sizes.setflags(write=False)
+            self._psf_cache[key] = (bank, sizes)
         return self._psf_cache[key]
-    
+
     def render_field(self,
                      target_ra: float,
                      target_dec: float,
@@ -471,20 +836,53 @@ class SkyRenderer:
         Output shape is (render_h, render_w) — the small buffer.
         """
         W, H = self.render_w, self.render_h
-        field = np.zeros((H, W), dtype=np.float32)
 
+        # The sky is the first layer, so it becomes the field itself
+        # (both branches return a fresh float32 array)
         if atm_state is not None:
             bg = atm_state.sky_background_field(H, W, exposure_s)
             # Mono: use luminance of RGB background
-            field += (bg[:,:,0]*0.299 + bg[:,:,1]*0.587 + bg[:,:,2]*0.114)
+            field = bg @ _LUMA_WEIGHTS
         else:
-            field += self._render_sky_background(W, H, exposure_s)
+            field = self._render_sky_background(W, H, exposure_s)
 
         self._render_dso(field, target_ra, target_dec, exposure_s, universe)
         self._render_stars(field, target_ra, target_dec, exposure_s, universe,
                            mag_limit, atm_state=atm_state)
         return field
     
+    def _sky_pattern(self, W: int, H: int, grad_strength: float) -> np.ndarray:
+        """
+        Normalised sky-glow shape: Milky Way diagonal gradient times
+        vignette, as a (H, W) float32 array. Depends only on the buffer
+        size and gradient strength, so it is built once and cached.
+        """
+        key = (W, H, grad_strength)
+        pattern = self._sky_pattern_cache.get(key)
+        if pattern is None:
+            xs = np.arange(W, dtype=np.float32)
+            ys = np.arange(H, dtype=np.float32)
+
+            # Milky Way gradient — slow diagonal variation, separable into
+            # a column term plus a row term
+            angle = 0.7
+            gx = xs * np.float32(math.cos(angle) / (W + H))
+            gy = ys * np.float32(math.sin(angle) / (W + H))
+            gx -= gx.min()
+            gy -= gy.min()
+            scale = np.float32(grad_strength / (gx.max() + gy.max() + 1e-9))
+            pattern = np.float32(1.0) + gy[:, None] * scale + gx[None, :] * scale
+
+            # Vignette
+            cx, cy = W / 2.0, H / 2.0
+            rx2 = ((xs - np.float32(cx)) / np.float32(cx)) ** 2
+            ry2 = ((ys - np.float32(cy)) / np.float32(cy)) ** 2
+            r = np.sqrt(ry2[:, None] + rx2[None, :])
+            pattern *= (1.0 - 0.30 * np.clip(r, 0, 1, out=r) ** 2.5)
+
+            self._sky_pattern_cache[key] = pattern
+        return pattern
+
     def _render_sky_background(self, W: int, H: int, exposure_s: float) -> np.ndarray:
         """
         Sky glow: uniform pedestal + Milky Way gradient + vignette.
@@ -494,21 +892,7 @@ class SkyRenderer:
             self.sky_background_mag, self.aperture_cm,
             self.pixel_scale, exposure_s)
 
-        yy, xx = np.mgrid[0:H, 0:W].astype(np.float32)
-
-        # Milky Way gradient — slow diagonal variation
-        angle = 0.7
-        grad = (xx * math.cos(angle) + yy * math.sin(angle)) / (W + H)
-        grad = (grad - grad.min()) / (grad.max() - grad.min() + 1e-9)
-
-        bg = (sky_ph * (1.0 + grad * 0.5)).astype(np.float32)
-
-        # Vignette
-        cx, cy = W / 2.0, H / 2.0
-        r = np.sqrt(((xx - cx) / cx)**2 + ((yy - cy) / cy)**2)
-        bg *= (1.0 - 0.30 * np.clip(r, 0, 1) ** 2.5)
-
-        return bg.astype(np.float32)
+        return self._sky_pattern(W, H, 0.5) * np.float32(sky_ph)
     
     def _radec_to_pixel(self, ra: float, dec: float,
                          center_ra: float, center_dec: float) -> Optional[Tuple[float, float]]:
@@ -545,6 +929,138 @@ class SkyRenderer:
         
         return (px, py)
     
+    def _radec_to_pixel_batch(self, ra: np.ndarray, dec: np.ndarray,
+                              center_ra: float, center_dec: float):
+        """
+        Gnomonic projection of RA/Dec arrays (degrees); same result as
+        _radec_to_pixel element by element.
+        
+        Returns:
+            (px, py, valid): pixel positions and a mask of points in front
+            of the projection plane (px, py are meaningless elsewhere)
+        """
+        ra_r = np.radians(ra)
+        dec_r = np.radians(dec)
+        ra0 = math.radians(center_ra)
+        dec0 = math.radians(center_dec)
+        
+        sin_dec, cos_dec = np.sin(dec_r), np.cos(dec_r)
+        dra = ra_r - ra0
+        cos_dra = np.cos(dra)
+        cos_c = math.sin(dec0) * sin_dec + math.cos(dec0) * cos_dec * cos_dra
+        valid = cos_c > 0
+        
+        scale = 206265.0 / self.pixel_scale  # render_pixels per radian
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv = scale / cos_c
+            x = cos_dec * np.sin(dra) * inv
+            y = (math.cos(dec0) * sin_dec - math.sin(dec0) * cos_dec * cos_dra) * inv
+        
+        px = self.render_w / 2.0 - x   # RA increases right→left
+        py = self.render_h / 2.0 - y   # Dec increases bottom→top
+        return px, py, valid
+    
+    def _project_stars(self, xyz: np.ndarray, center_ra: float, center_dec: float,
+                       W: int, H: int, margin: float = 20.0):
+        """
+        Gnomonic projection of many stars at once.
+
+        Rotates equatorial unit vectors into the tangent-plane frame of
+        (center_ra, center_dec) with one (N, 3) @ (3, 3) product; same
+        result as _radec_to_pixel per star.
+
+        Args:
+            xyz: (N, 3) unit vectors (see Universe.get_stars_soa)
+            center_ra, center_dec: Field centre in degrees
+            W, H: Buffer size in pixels
+            margin: Pixels beyond the buffer edge still kept
+
+        Returns:
+            (keep, px, py): boolean mask of stars in front of the plane and
+            inside the margin box, and their pixel positions
+        """
+        ra0 = math.radians(center_ra)
+        dec0 = math.radians(center_dec)
+        sa, ca = math.sin(ra0), math.cos(ra0)
+        sd, cd = math.sin(dec0), math.cos(dec0)
+        # Rows: tangent-plane east, north, and the view axis
+        rot = np.array([[-sa,      ca,      0.0],
+                        [-sd * ca, -sd * sa, cd],
+                        [cd * ca,  cd * sa,  sd]])
+        east, north, cos_c = (xyz @ rot.T).T
+
+        scale = 206265.0 / self.pixel_scale  # render_pixels per radian
+        front = cos_c > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv = scale / cos_c
+        px = self.render_w / 2.0 - east * inv   # RA increases right→left
+        py = self.render_h / 2.0 - north * inv  # Dec increases bottom→top
+        keep = (front & (px >= -margin) & (px <= W + margin)
+                & (py >= -margin) & (py <= H + margin))
+        return keep, px[keep], py[keep]
+
+    @staticmethod
+    def _ra_half_width(ra_margin: float, center_dec: float) -> float:
+        """RA half-width (degrees of RA) of a box ra_margin degrees wide on sky."""
+        return ra_margin / max(0.01, math.cos(math.radians(center_dec)))
+    
+    def _visible_mask(self, ra: np.ndarray, dec: np.ndarray,
+                      center_ra: float, center_dec: float,
+                      ra_margin: float, dec_margin: float) -> np.ndarray:
+        """
+        Mask of catalogue positions inside the FOV box around (center_ra,
+        center_dec): |dDec| <= dec_margin and the wrapped |dRA| within
+        ra_margin stretched by 1/cos(dec).
+        """
+        dra = np.abs(ra - center_ra)
+        np.minimum(dra, 360.0 - dra, out=dra)
+        return ((dra <= self._ra_half_width(ra_margin, center_dec))
+                & (np.abs(dec - center_dec) <= dec_margin))
+    
+    def _cull_stars(self, soa: dict, center_ra: float, center_dec: float,
+                    mag_limit: float, dec_margin: float) -> np.ndarray:
+        """
+        Indices of catalogue stars inside the FOV box (plus margin) and
+        brighter than mag_limit, in catalogue order. Candidates come from
+        the universe's zone index: for each declination zone the box
+        touches, the RA window (split at 0°/360° if it wraps) is two
+        searchsorted calls; only those candidates are tested with masks.
+        """
+        ra_margin_adj = self._ra_half_width(self.fov_w * 0.75, center_dec)
+
+        dec_lo, dec_hi = center_dec - dec_margin, center_dec + dec_margin
+        zone_start = soa['zone_start']
+        n_zones = len(zone_start) - 1
+        zone_h = 180.0 / n_zones
+        z0 = max(0, int((dec_lo + 90.0) // zone_h))
+        z1 = min(n_zones - 1, int((dec_hi + 90.0) // zone_h))
+
+        # RA windows on [0, 360)
+        if ra_margin_adj >= 180.0:
+            windows = ((0.0, 360.0),)
+        else:
+            ra_lo = (center_ra - ra_margin_adj) % 360.0
+            ra_hi = (center_ra + ra_margin_adj) % 360.0
+            windows = ((ra_lo, ra_hi),) if ra_lo <= ra_hi else ((ra_lo, 360.0), (0.0, ra_hi))
+
+        zone_ra = soa['zone_ra']
+        spans = []
+        for z in range(z0, z1 + 1):
+            a, b = zone_start[z], zone_start[z + 1]
+            for lo, hi in windows:
+                i0 = a + np.searchsorted(zone_ra[a:b], lo, side='left')
+                i1 = a + np.searchsorted(zone_ra[a:b], hi, side='right')
+                if i1 > i0:
+                    spans.append(soa['zone_order'][i0:i1])
+        if not spans:
+            return np.empty(0, dtype=np.intp)
+        cand = np.sort(np.concatenate(spans))
+
+        dec = soa['dec'][cand]
+        mask = ((soa['mag'][cand] <= mag_limit)
+                & (dec >= dec_lo) & (dec <= dec_hi))
+        return cand[mask]
+
     def _render_stars(self, field: np.ndarray,
                        center_ra: float, center_dec: float,
                        exposure_s: float, universe,
@@ -553,60 +1069,88 @@ class SkyRenderer:
         """Render stars from catalog onto field, with optional atmospheric extinction."""
         H, W = field.shape
 
-        ra_margin    = self.fov_w * 0.75
-        dec_margin   = self.fov_h * 0.75
-        dec_min      = center_dec - dec_margin
-        dec_max      = center_dec + dec_margin
-        ra_margin_adj = ra_margin / max(0.01, math.cos(math.radians(center_dec)))
+        soa = universe.get_stars_soa()
+        idx = self._cull_stars(soa, center_ra, center_dec, mag_limit,
+                               self.fov_h * 0.75)
 
-        n_rendered = 0
+        keep, xs, ys = self._project_stars(soa['xyz'][idx], center_ra, center_dec, W, H)
+        idx = idx[keep]
 
-        for star in universe.get_stars():
-            if star.mag > mag_limit:
-                continue
-            if star.dec_deg < dec_min or star.dec_deg > dec_max:
-                continue
-            dra = abs(star.ra_deg - center_ra)
-            if dra > 180: dra = 360 - dra
-            if dra > ra_margin_adj:
-                continue
+        # Apparent magnitude after atmospheric extinction
+        eff_mags = soa['mag'][idx]
+        if atm_state is not None:
+            # Convert pixel position to approximate altitude
+            # (centre of field = target altitude; edges ±FOV/2)
+            # Simple approximation: use target altitude for all stars in field
+            alt = self._target_alt if hasattr(self, '_target_alt') else 45.0
+            ext = atm_state.extinction_at_array(alt, soa['bv'][idx])
+            eff_mags = eff_mags + ext
+            visible = eff_mags <= mag_limit + 1.0   # extincted below limit
+            xs, ys, eff_mags = xs[visible], ys[visible], eff_mags[visible]
+
+        photons = mag_to_flux_array(eff_mags, self.aperture_cm, exposure_s)
+        return self._splat_stars((field,), xs, ys,
+                                 photons[:, None], eff_mags)
+    
+    def _splat_stars(self, fields, px: np.ndarray, py: np.ndarray,
+                     photons: np.ndarray, eff_mags: np.ndarray) -> int:
+        """
+        Add star PSFs into one or more fields.
 
-            pos = self._radec_to_pixel(star.ra_deg, star.dec_deg, center_ra, center_dec)
-            if pos is None:
-                continue
-            px, py = pos
-            if px < -20 or px > W + 20 or py < -20 or py > H + 20:
-                continue
+        Bright stars get individual stamps from the PSF bank, except that a
+        crowded band whose stamps would cost more than one separable blur
+        (DELTA_SPLAT_RATIO) is rendered as a blurred delta map; stars in the
+        faint bands (eff_mag >= FAINT_STAR_MAG) are deposited as sub-pixel
+        impulses and blurred once per band. Stars too faint to put
+        NEGLIGIBLE_PHOTONS into their peak pixel are skipped.
 
-            # Apparent magnitude after atmospheric extinction
-            eff_mag = star.mag
-            if atm_state is not None:
-                # Convert pixel position to approximate altitude
-                # (centre of field = target altitude; edges ±FOV/2)
-                # Simple approximation: use target altitude for all stars in field
-                ext = atm_state.extinction_at(
-                    self._target_alt if hasattr(self, '_target_alt') else 45.0,
-                    getattr(star, 'bv_color', 0.6)
-                )
-                eff_mag += ext
-                if eff_mag > mag_limit + 1.0:
-                    continue   # extincted below limit
-
-            photons = mag_to_flux(eff_mag, self.aperture_cm, exposure_s)
-            psf, size = self._get_psf(eff_mag)
-
-            ix, iy = int(round(px)), int(round(py))
-            y0 = max(0, iy - size);  y1 = min(H, iy + size + 1)
-            x0 = max(0, ix - size);  x1 = min(W, ix + size + 1)
-            ky0 = size - (iy - y0);  ky1 = ky0 + (y1 - y0)
-            kx0 = size - (ix - x0);  kx1 = kx0 + (x1 - x0)
-
-            if y0 < y1 and x0 < x1 and ky0 < ky1 and kx0 < kx1:
-                field[y0:y1, x0:x1] += (psf[ky0:ky1, kx0:kx1] * photons).astype(np.float32)
-                n_rendered += 1
+        Args:
+            fields: Sequence of (H, W) float32 fields
+            px, py: Star pixel positions
+            photons: (N, len(fields)) photons per star per field
+            eff_mags: Effective magnitudes (select the PSF band)
 
+        Returns:
+            Number of stars rendered
+        """
+        if len(px) == 0:
+            return 0
+        bank, sizes = self._get_psf_bank()
+        bands = np.digitize(eff_mags, _PSF_BAND_EDGES)
+
+        # Drop stars that cannot put NEGLIGIBLE_PHOTONS into any pixel
+        peak = bank.max(axis=(1, 2))
+        lit = photons.max(axis=1) * peak[bands] >= NEGLIGIBLE_PHOTONS
+        if not lit.all():
+            px, py, photons, bands = px[lit], py[lit], photons[lit], bands[lit]
+
+        bright = bands < _FAINT_BAND
+        ix = np.rint(px).astype(np.int64)
+        iy = np.rint(py).astype(np.int64)
+        n_rendered = 0
+        for band in range(_FAINT_BAND):
+            sel = bands == band
+            n = int(np.count_nonzero(sel))
+            if n < 2:
+                continue
+            _, factor, size = PSF_BANDS[band]
+            k = 2 * size + 1
+            area = float((np.ptp(ix[sel]) + k) * (np.ptp(iy[sel]) + k))
+            if n * k > DELTA_SPLAT_RATIO * area:
+                n_rendered += splat_deltas(fields, ix[sel], iy[sel], photons[sel],
+                                           self.psf_sigma * factor, size)
+                bright &= ~sel
+        n_rendered += splat_stamps(fields, ix[bright], iy[bright], photons[bright],
+                                   bands[bright], bank, sizes)
+
+        for band in range(_FAINT_BAND, len(PSF_BANDS)):
+            sel = bands == band
+            if sel.any():
+                _, factor, size = PSF_BANDS[band]
+                n_rendered += splat_impulses(fields, px[sel], py[sel], photons[sel],
+                                             self.psf_sigma * factor, size)
         return n_rendered
-    
+
     def _render_dso(self, field: np.ndarray,
                      center_ra: float, center_dec: float,
                      exposure_s: float, universe) -> int:
@@ -616,26 +1160,27 @@ class SkyRenderer:
         ra_margin = self.fov_w * 0.75
         dec_margin = self.fov_h * 0.7
         
+        # Cull and project the whole catalogue with array ops; only the
+        # DSOs that land near the buffer reach the per-object loop
+        soa = universe.get_dso_soa()
+        ra, dec, mag = soa['ra'], soa['dec'], soa['mag']
+        
+        cand = np.flatnonzero(
+            (mag <= 14.0)
+            & self._visible_mask(ra, dec, center_ra, center_dec,
+                                 ra_margin, dec_margin))
+        pxs, pys, valid = self._radec_to_pixel_batch(ra[cand], dec[cand],
+                                                     center_ra, center_dec)
+        valid &= ((pxs >= -100) & (pxs <= W + 100)
+                  & (pys >= -100) & (pys <= H + 100))
+        
+        from universe.space_object import ObjectClass
+        
         n_rendered = 0
         
-        for obj in universe.get_dso():
-            if obj.mag > 14.0:
-                continue
-            
-            # Bounding box
-            if abs(obj.dec_deg - center_dec) > dec_margin:
-                continue
-            dra = abs(obj.ra_deg - center_ra)
-            if dra > 180: dra = 360 - dra
-            if dra > ra_margin / max(0.01, math.cos(math.radians(center_dec))):
-                continue
-            
-            pos = self._radec_to_pixel(obj.ra_deg, obj.dec_deg, center_ra, center_dec)
-            if pos is None:
-                continue
-            
-            px, py = pos
-            if px < -100 or px > W + 100 or py < -100 or py > H + 100:
+        for obj, px, py in zip(soa['objects'][cand[valid]], pxs[valid].tolist(),
+                               pys[valid].tolist()):
+            if not obj.is_visible_in_chart:
                 continue
             
             # Total photons
@@ -647,8 +1192,6 @@ class SkyRenderer:
             size_px = max(3.0, min(size_px, min(W, H) * 0.4))
             
             # Render by type
-            from universe.space_object import ObjectClass, ObjectSubtype
-            
             if obj.obj_class == ObjectClass.GALAXY:
                 bv = obj.meta.get("bv_color", obj.bv_color)
                 render_galaxy(field, px, py, photons, size_px, bv)
@@ -699,75 +1242,40 @@ class SkyRenderer:
             # Legacy: uniform mono background with slight blue tint
             sky_ph = sky_photons_per_pixel(
                 self.sky_background_mag, self.aperture_cm, self.pixel_scale, exposure_s)
-            yy, xx = np.mgrid[0:H, 0:W].astype(np.float32)
-            grad = (xx * math.cos(0.7) + yy * math.sin(0.7)) / (W + H)
-            grad = (grad - grad.min()) / (grad.max() - grad.min() + 1e-9)
-            sky_map = (sky_ph * (1.0 + grad * 0.4)).astype(np.float32)
-            cx, cy = W/2.0, H/2.0
-            r2 = np.sqrt(((xx-cx)/cx)**2 + ((yy-cy)/cy)**2)
-            sky_map *= (1.0 - 0.30 * np.clip(r2, 0, 1)**2.5).astype(np.float32)
-            field_r += sky_map * 0.85
-            field_g += sky_map * 1.00
-            field_b += sky_map * 1.10
+            _add_tinted((field_r, field_g, field_b), self._sky_pattern(W, H, 0.4),
+                        sky_ph * np.array([0.85, 1.00, 1.10]))
 
         # ── DSOs ─────────────────────────────────────────────────────────
         dso_lum = np.zeros_like(field_g)
         self._render_dso(dso_lum, target_ra, target_dec, exposure_s, universe)
-        field_r += dso_lum * 0.9
-        field_g += dso_lum * 1.0
-        field_b += dso_lum * 0.8
+        _add_tinted((field_r, field_g, field_b), dso_lum, (0.9, 1.0, 0.8))
 
         # ── Stars ────────────────────────────────────────────────────────
-        ra_margin     = self.fov_w * 0.75
-        dec_margin    = self.fov_h * 0.6
-        dec_min       = target_dec - dec_margin
-        dec_max       = target_dec + dec_margin
-        ra_margin_adj = ra_margin / max(0.01, math.cos(math.radians(target_dec)))
+        soa = universe.get_stars_soa()
+        idx = self._cull_stars(soa, target_ra, target_dec, mag_limit,
+                               self.fov_h * 0.6)
 
         # Target altitude (for extinction calculation)
         target_alt = getattr(self, '_target_alt', 45.0)
 
-        for star in universe.get_stars():
-            if star.mag > mag_limit:
-                continue
-            if star.dec_deg < dec_min or star.dec_deg > dec_max:
-                continue
-            dra = abs(star.ra_deg - target_ra)
-            if dra > 180: dra = 360 - dra
-            if dra > ra_margin_adj:
-                continue
-
-            pos = self._radec_to_pixel(star.ra_deg, star.dec_deg, target_ra, target_dec)
-            if pos is None:
-                continue
-            px, py = pos
-            if px < -20 or px > W + 20 or py < -20 or py > H + 20:
-                continue
+        keep, xs, ys = self._project_stars(soa['xyz'][idx], target_ra, target_dec, W, H)
+        idx = idx[keep]
 
-            # Extinction
-            eff_mag = star.mag
-            if atm_state is not None:
-                ext = atm_state.extinction_at(target_alt,
-                                               getattr(star, 'bv_color', 0.6))
-                eff_mag += ext
-                if eff_mag > mag_limit + 1.0:
-                    continue
-
-            total_photons = mag_to_flux(eff_mag, self.aperture_cm, exposure_s)
-            r, g, b = bv_to_rgb(star.bv_color)
-
-            psf, size = self._get_psf(eff_mag)
-            ix, iy = int(round(px)), int(round(py))
-            y0 = max(0, iy-size); y1 = min(H, iy+size+1)
-            x0 = max(0, ix-size); x1 = min(W, ix+size+1)
-            ky0 = size-(iy-y0); ky1 = ky0+(y1-y0)
-            kx0 = size-(ix-x0); kx1 = kx0+(x1-x0)
-
-            if y0 < y1 and x0 < x1 and ky0 < ky1 and kx0 < kx1:
-                patch = psf[ky0:ky1, kx0:kx1] * total_photons
-                field_r[y0:y1, x0:x1] += (patch * r).astype(np.float32)
-                field_g[y0:y1, x0:x1] += (patch * g).astype(np.float32)
-                field_b[y0:y1, x0:x1] += (patch * b).astype(np.float32)
+        # Extinction
+        eff_mags = soa['mag'][idx]
+        bvs = soa['bv'][idx]
+        if atm_state is not None:
+            ext = atm_state.extinction_at_array(target_alt, bvs)
+            eff_mags = eff_mags + ext
+            visible = eff_mags <= mag_limit + 1.0
+            xs, ys = xs[visible], ys[visible]
+            eff_mags, bvs = eff_mags[visible], bvs[visible]
+
+        if len(xs) == 0:
+            return
+        photons = mag_to_flux_array(eff_mags, self.aperture_cm, exposure_s)
+        self._splat_stars((field_r, field_g, field_b), xs, ys,
+                          photons[:, None] * bv_to_rgb_array(bvs), eff_mags)
     
     def get_info(self) -> dict:
         """Return optical parameters for display."""
@@ -12,54 +12,352 @@ CALIBRATION TARGETS (post tone-map):
 
 All intensities are in raw photon units.  The _allsky_to_surface pipeline
 applies asinh tone-mapping afterwards.
+
+The painters run as Numba kernels when available, NumPy otherwise; a
+field that already lives on the GPU (__cuda_array_interface__) is
+painted in place by CUDA kernels.
 """
 from __future__ import annotations
 import math
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from typing import Optional, Tuple
 
+from imaging.sky_renderer import bv_to_rgb_array, mag_to_flux_array
+from imaging.star_splat import HAS_CUDA, HAS_NUMBA
+from universe.planet_physics import (SATURN_RING_OUTER_KM, _KM_PER_AU,
+                                     _ARCSEC_PER_RAD, phase_bv_correction)
+
+if HAS_NUMBA:
+    import numba
+if HAS_CUDA:
+    from numba import cuda
+
+
+_DEG2RAD = math.pi / 180.0
+
 
 def _altaz_to_xy(alt_deg, az_deg, cx, cy, radius):
     if alt_deg < -0.5:
         return None
     r_px = (90.0 - alt_deg) / 90.0 * radius
-    az_r  = math.radians(az_deg)
+    az_r  = az_deg * _DEG2RAD
     return cx + r_px * math.sin(az_r), cy - r_px * math.cos(az_r)
 
 
+def _clip_bbox(field, px, py, pad):
+    """
+    Bounding box (x0, x1, y0, y1) of a footprint reaching pad pixels
+    around (px, py), clipped to the field; None when nothing of it lands
+    on the field, so painters can return before any array work.
+    """
+    H, W = field.shape[:2]
+    x0 = max(0, int(px) - pad); x1 = min(W, int(px) + pad + 1)
+    y0 = max(0, int(py) - pad); y1 = min(H, int(py) + pad + 1)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, x1, y0, y1
+
+
+def _bbox_grid(x0, x1, y0, y1):
+    """
+    Pixel coordinates of a bounding box as a float32 (h, 1) column and
+    (1, w) row: per-axis terms stay 1-D and broadcast to (h, w) only when
+    combined, instead of materialising two full np.mgrid planes.
+    """
+    yy = np.arange(y0, y1, dtype=np.float32)[:, None]
+    xx = np.arange(x0, x1, dtype=np.float32)[None, :]
+    return yy, xx
+
+
+def _add_rgb(field, x0, x1, y0, y1, profile, colour, intensity):
+    """
+    field[y0:y1, x0:x1, c] += profile * intensity * colour[c]. Intensity
+    and colour fold into one float32 scale per channel, so each channel
+    costs a single multiply-add pass over the profile. (A broadcast
+    (h, w, 3) write is slower in NumPy: its innermost loop is only three
+    elements long.) One scaled-profile scratch serves all channels.
+    """
+    scaled = np.empty((y1 - y0, x1 - x0), dtype=np.float32)
+    for c, col in enumerate(colour):
+        np.multiply(profile, np.float32(intensity * col), out=scaled)
+        field[y0:y1, x0:x1, c] += scaled
+
+
+# Painter boxes below this many pixels run serially: starting the
+# parallel region costs more than a small disk's pixels.
+PARALLEL_MIN_PIXELS = 64 * 64
+
+# Row bands per thread for the parallel painters
+_BANDS_PER_THREAD = 4
+
+
+def _row_bands(x0, x1, y0, y1):
+    """
+    Number of row bands to split a painter box into, or 0 when it is
+    too small (or there is a single thread) and the serial kernel wins.
+    """
+    n_threads = numba.get_num_threads()
+    if n_threads == 1 or (x1 - x0) * (y1 - y0) < PARALLEL_MIN_PIXELS:
+        return 0
+    return min(y1 - y0, n_threads * _BANDS_PER_THREAD)
+
+
+if HAS_NUMBA:
+    # Compiled painters: one fused pass over rows y0..y1 of the bounding
+    # box that evaluates the profile once per pixel and adds it to every
+    # channel, with no bbox-sized temporaries. Pixels outside a disk are
+    # skipped outright. Keep in step with the NumPy painters.
+    #
+    # *_rows paint serially (without the GIL, so render_planets can run
+    # several bodies at once); the *_kernel wrappers run them over
+    # n_bands row bands in parallel, for large boxes.
+
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _disk_rows(field, px, py, R, colour, intensity, x0, x1, y0, y1):
+        inv_r2 = 1.0 / (R * R)
+        for y in range(y0, y1):
+            dy = y - py
+            for x in range(x0, x1):
+                dx = x - px
+                t = 1.0 - (dx * dx + dy * dy) * inv_r2
+                if t <= 0.0:
+                    continue
+                v = math.sqrt(t) * intensity
+                for c in range(colour.shape[0]):
+                    field[y, x, c] += v * colour[c]
+
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _glow_rows(field, px, py, sigma, colour, intensity, x0, x1, y0, y1):
+        # Separable: exp(k(dx^2 + dy^2)) = exp(k dx^2) * exp(k dy^2), so
+        # one exp per column and per row, a multiply per pixel
+        k = -0.5 / (sigma * sigma)
+        gx = np.empty(x1 - x0, dtype=np.float32)
+        for x in range(x0, x1):
+            dx = x - px
+            gx[x - x0] = math.exp(dx * dx * k) * intensity
+        for y in range(y0, y1):
+            dy = y - py
+            gy = math.exp(dy * dy * k)
+            for x in range(x0, x1):
+                v = gy * gx[x - x0]
+                for c in range(colour.shape[0]):
+                    field[y, x, c] += v * colour[c]
+
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _moon_disk_rows(field, px, py, R, side, k_term, colour, intensity,
+                        x0, x1, y0, y1):
+        # Lit where side * nx >= k_term * sqrt(1 - ny^2): side = +1 with
+        # k_term = -cos(phase) while waxing, side = -1 with
+        # k_term = cos(360 - phase) while waning
+        inv_r = 1.0 / R
+        for y in range(y0, y1):
+            ny = (y - py) * inv_r
+            ny_safe = math.sqrt(max(0.0, 1.0 - ny * ny))
+            mare_y = math.cos(ny * 7.8 - 0.4)
+            for x in range(x0, x1):
+                nx = (x - px) * inv_r
+                dr2 = nx * nx + ny * ny
+                if dr2 > 1.0 or side * nx < k_term * ny_safe:
+                    continue
+                mare = 0.88 + 0.12 * math.sin(nx * 6.2 + 1.1) * mare_y
+                v = math.sqrt(1.0 - dr2) * mare * intensity
+                for c in range(colour.shape[0]):
+                    field[y, x, c] += v * colour[c]
+
+    @numba.njit(cache=True, parallel=True)
+    def _disk_kernel(field, px, py, R, colour, intensity, x0, x1, y0, y1,
+                     n_bands):
+        step = (y1 - y0 + n_bands - 1) // n_bands
+        for b in numba.prange(n_bands):
+            ya = y0 + b * step
+            _disk_rows(field, px, py, R, colour, intensity, x0, x1,
+                       ya, min(y1, ya + step))
+
+    @numba.njit(cache=True, parallel=True)
+    def _glow_kernel(field, px, py, sigma, colour, intensity, x0, x1, y0, y1,
+                     n_bands):
+        step = (y1 - y0 + n_bands - 1) // n_bands
+        for b in numba.prange(n_bands):
+            ya = y0 + b * step
+            _glow_rows(field, px, py, sigma, colour, intensity, x0, x1,
+                       ya, min(y1, ya + step))
+
+    @numba.njit(cache=True, parallel=True)
+    def _moon_disk_kernel(field, px, py, R, side, k_term, colour, intensity,
+                          x0, x1, y0, y1, n_bands):
+        step = (y1 - y0 + n_bands - 1) // n_bands
+        for b in numba.prange(n_bands):
+            ya = y0 + b * step
+            _moon_disk_rows(field, px, py, R, side, k_term, colour, intensity,
+                            x0, x1, ya, min(y1, ya + step))
+
+if HAS_CUDA:
+    # Device painters for a field that already lives on the GPU (any
+    # array exposing __cuda_array_interface__: Numba device arrays,
+    # CuPy, ...). One thread per bounding-box pixel and one body per
+    # launch, so no pixel is written twice and no atomics are needed.
+    # (r, g, b) arrive with the intensity folded in. Same profiles as
+    # the CPU painters above.
+
+    _CUDA_TILE = (16, 16)
+
+    def _cuda_grid(x0, x1, y0, y1):
+        tx, ty = _CUDA_TILE
+        return ((x1 - x0 + tx - 1) // tx, (y1 - y0 + ty - 1) // ty), _CUDA_TILE
+
+    @cuda.jit
+    def _disk_cuda(field, px, py, R, r, g, b, x0, x1, y0, y1):
+        x, y = cuda.grid(2)
+        x += x0; y += y0
+        if x >= x1 or y >= y1:
+            return
+        dx = x - px; dy = y - py
+        t = 1.0 - (dx * dx + dy * dy) / (R * R)
+        if t <= 0.0:
+            return
+        v = math.sqrt(t)
+        field[y, x, 0] += v * r; field[y, x, 1] += v * g; field[y, x, 2] += v * b
+
+    @cuda.jit
+    def _glow_cuda(field, px, py, sigma, r, g, b, x0, x1, y0, y1):
+        x, y = cuda.grid(2)
+        x += x0; y += y0
+        if x >= x1 or y >= y1:
+            return
+        dx = x - px; dy = y - py
+        v = math.exp(-0.5 * (dx * dx + dy * dy) / (sigma * sigma))
+        field[y, x, 0] += v * r; field[y, x, 1] += v * g; field[y, x, 2] += v * b
+
+    @cuda.jit
+    def _moon_disk_cuda(field, px, py, R, side, k_term, r, g, b,
+                        x0, x1, y0, y1):
+        x, y = cuda.grid(2)
+        x += x0; y += y0
+        if x >= x1 or y >= y1:
+            return
+        nx = (x - px) / R; ny = (y - py) / R
+        dr2 = nx * nx + ny * ny
+        if dr2 > 1.0 or side * nx < k_term * math.sqrt(max(0.0, 1.0 - ny * ny)):
+            return
+        mare = 0.88 + 0.12 * math.sin(nx * 6.2 + 1.1) * math.cos(ny * 7.8 - 0.4)
+        v = math.sqrt(1.0 - dr2) * mare
+        field[y, x, 0] += v * r; field[y, x, 1] += v * g; field[y, x, 2] += v * b
+
+    @cuda.jit
+    def _rings_cuda(field, px, py, inv_a, inv_b, r, g, b, x0, x1, y0, y1):
+        x, y = cuda.grid(2)
+        x += x0; y += y0
+        if x >= x1 or y >= y1:
+            return
+        ex = (x - px) * inv_a; ey = (y - py) * inv_b
+        ell = ex * ex + ey * ey
+        v = (min(max((ell - 0.30) * 20.0, 0.0), 1.0)
+             * min(max((1.0 - ell) * 20.0, 0.0), 1.0))
+        if v > 0.0:
+            field[y, x, 0] += v * r; field[y, x, 1] += v * g; field[y, x, 2] += v * b
+
+    @cuda.jit
+    def _points_cuda(field, ix, iy, rgb):
+        # Bodies may share a pixel: accumulate atomically
+        i = cuda.grid(1)
+        if i >= ix.shape[0]:
+            return
+        for c in range(3):
+            cuda.atomic.add(field, (iy[i], ix[i], c), rgb[i, c])
+
+
+def _on_device(field):
+    """True when field is a GPU array the CUDA painters can write to."""
+    return HAS_CUDA and hasattr(field, '__cuda_array_interface__')
+
+
+def _scaled_rgb(colour, intensity):
+    """(r, g, b) scalars with the intensity folded in, for the device painters."""
+    return tuple(float(intensity * col) for col in colour)
+
+
 def _paint_disk(field, px, py, radius_px, colour, intensity):
     """Limb-darkened circular disk."""
-    H, W = field.shape[:2]
     R   = max(radius_px, 0.6)
     pad = int(math.ceil(R)) + 2
-    x0=max(0,int(px)-pad); x1=min(W,int(px)+pad+1)
-    y0=max(0,int(py)-pad); y1=min(H,int(py)+pad+1)
-    yy, xx = np.mgrid[y0:y1, x0:x1].astype(np.float32)
-    dr = np.sqrt((xx-px)**2 + (yy-py)**2)
-    limb = np.sqrt(np.clip(1.0 - (dr/R)**2, 0.0, 1.0))
-    for c, col in enumerate(colour):
-        field[y0:y1, x0:x1, c] += limb * intensity * col
+    box = _clip_bbox(field, px, py, pad)
+    if box is None:
+        return
+    x0, x1, y0, y1 = box
+    if _on_device(field):
+        _disk_cuda[_cuda_grid(x0, x1, y0, y1)](
+            field, px, py, R, *_scaled_rgb(colour, intensity), x0, x1, y0, y1)
+        return
+    if HAS_NUMBA:
+        colour = np.asarray(colour, dtype=np.float32)
+        n_bands = _row_bands(x0, x1, y0, y1)
+        if n_bands:
+            _disk_kernel(field, px, py, R, colour, intensity,
+                         x0, x1, y0, y1, n_bands)
+        else:
+            _disk_rows(field, px, py, R, colour, intensity, x0, x1, y0, y1)
+        return
+    yy, xx = _bbox_grid(x0, x1, y0, y1)
+    # Squared radius in units of R straight from the 1-D terms: one sqrt
+    # per pixel (the limb) instead of two plus a divide
+    inv_r2 = np.float32(1.0 / (R * R))
+    # The one bbox-sized array: dr2, turned into the limb in place
+    limb = (xx - px)**2 * inv_r2 + (yy - py)**2 * inv_r2
+    np.subtract(1.0, limb, out=limb)
+    np.maximum(limb, 0.0, out=limb)
+    np.sqrt(limb, out=limb)
+    _add_rgb(field, x0, x1, y0, y1, limb, colour, intensity)
+
+
+# Glows are cut where they fall below this many photons per pixel (far
+# under the sky's shot noise), and never beyond 4 sigma.
+GLOW_CUTOFF_PH = 0.05
 
 
 def _paint_glow(field, px, py, sigma, colour, intensity):
     """Gaussian glow/halo."""
-    H, W = field.shape[:2]
-    pad = int(math.ceil(sigma * 4))
-    x0=max(0,int(px)-pad); x1=min(W,int(px)+pad+1)
-    y0=max(0,int(py)-pad); y1=min(H,int(py)+pad+1)
-    yy, xx = np.mgrid[y0:y1, x0:x1].astype(np.float32)
-    gauss = np.exp(-((xx-px)**2+(yy-py)**2) / (2.0*sigma**2))
-    for c, col in enumerate(colour):
-        field[y0:y1, x0:x1, c] += gauss * intensity * col
+    # Radius where the brightest channel drops to GLOW_CUTOFF_PH: a dim
+    # halo gets a much smaller box than the fixed 4 sigma
+    peak = intensity * max(colour)
+    if peak <= GLOW_CUTOFF_PH:
+        return
+    n_sigma = min(4.0, math.sqrt(2.0 * math.log(peak / GLOW_CUTOFF_PH)))
+    pad = int(math.ceil(sigma * n_sigma))
+    box = _clip_bbox(field, px, py, pad)
+    if box is None:
+        return
+    x0, x1, y0, y1 = box
+    if _on_device(field):
+        _glow_cuda[_cuda_grid(x0, x1, y0, y1)](
+            field, px, py, sigma, *_scaled_rgb(colour, intensity),
+            x0, x1, y0, y1)
+        return
+    if HAS_NUMBA:
+        colour = np.asarray(colour, dtype=np.float32)
+        n_bands = _row_bands(x0, x1, y0, y1)
+        if n_bands:
+            _glow_kernel(field, px, py, sigma, colour, intensity,
+                         x0, x1, y0, y1, n_bands)
+        else:
+            _glow_rows(field, px, py, sigma, colour, intensity, x0, x1, y0, y1)
+        return
+    yy, xx = _bbox_grid(x0, x1, y0, y1)
+    # Separable: exp per row and per column, one multiply per pixel
+    k = np.float32(-0.5 / sigma**2)
+    gauss = np.exp((yy - py)**2 * k) * np.exp((xx - px)**2 * k)
+    _add_rgb(field, x0, x1, y0, y1, gauss, colour, intensity)
 
 
 # ── Sun ───────────────────────────────────────────────────────────────────────
 
 SUN_ANGULAR_DIAM_DEG = 0.533
 
-SUN_DISK_COL   = (1.00, 0.95, 0.78)   # 5778K warm white
-SUN_CORONA_COL = (1.00, 0.85, 0.50)   # inner corona / bloom
-SUN_GLOW_COL   = (1.00, 0.60, 0.20)   # horizon glow (amber/orange)
+# Colours are float32 RGB arrays, ready for the painters' fused writes
+SUN_DISK_COL   = np.array([1.00, 0.95, 0.78], dtype=np.float32)   # 5778K warm white
+SUN_CORONA_COL = np.array([1.00, 0.85, 0.50], dtype=np.float32)   # inner corona / bloom
+SUN_GLOW_COL   = np.array([1.00, 0.60, 0.20], dtype=np.float32)   # horizon glow (amber/orange)
 
 
 def render_sun(field, sun_alt_deg, sun_az_deg, cx, cy, radius, exposure_s=1.0):
@@ -77,32 +375,28 @@ def render_sun(field, sun_alt_deg, sun_az_deg, cx, cy, radius, exposure_s=1.0):
     naturally dominates at dawn/dusk but is invisible deep at night.
     """
     disk_r_px = (SUN_ANGULAR_DIAM_DEG / 2.0) / 90.0 * radius
+    # Azimuth direction, shared by the disk and the horizon glow anchor
+    az_r = sun_az_deg * _DEG2RAD
+    sin_az, cos_az = math.sin(az_r), math.cos(az_r)
 
     # ── 1. Solar disk (above horizon only) ───────────────────────────
     if sun_alt_deg > 0.0:
-        pos = _altaz_to_xy(sun_alt_deg, sun_az_deg, cx, cy, radius)
-        if pos is not None:
-            px, py = pos
-            airmass = 1.0 / max(math.sin(math.radians(sun_alt_deg)), 0.05)
-            atm_ext = 0.20 * airmass
-            # 800× exposure → well above white point → saturates to white
-            sun_flux = 800.0 * exposure_s * 10**(-0.4 * atm_ext)
-            _paint_disk(field, px, py, disk_r_px, SUN_DISK_COL, sun_flux)
-            # Inner corona: sigma = 2.5× disk radius
-            _paint_glow(field, px, py, disk_r_px * 2.5, SUN_CORONA_COL,
-                        sun_flux * 0.06)
-            # Flare streak toward image centre
-            _paint_lens_flare(field, px, py, cx, cy, sun_flux * 0.015, SUN_GLOW_COL)
+        r_px = (90.0 - sun_alt_deg) / 90.0 * radius
+        px, py = cx + r_px * sin_az, cy - r_px * cos_az
+        airmass = 1.0 / max(math.sin(sun_alt_deg * _DEG2RAD), 0.05)
+        atm_ext = 0.20 * airmass
+        # 800× exposure → well above white point → saturates to white
+        sun_flux = 800.0 * exposure_s * 10**(-0.4 * atm_ext)
+        _paint_disk(field, px, py, disk_r_px, SUN_DISK_COL, sun_flux)
+        # Inner corona: sigma = 2.5× disk radius
+        _paint_glow(field, px, py, disk_r_px * 2.5, SUN_CORONA_COL,
+                    sun_flux * 0.06)
+        # Flare streak toward image centre
+        _paint_lens_flare(field, px, py, cx, cy, sun_flux * 0.015, SUN_GLOW_COL)
 
     # ── 2. Horizon glow (twilight -18°→0° and low sun 0°→20°) ────────
     glow_alt = max(sun_alt_deg, -18.0)
     if glow_alt > -18.0:
-        # Anchor at horizon edge in solar azimuth
-        az_r  = math.radians(sun_az_deg)
-        r_hor = radius * 0.97
-        gx = cx + r_hor * math.sin(az_r)
-        gy = cy - r_hor * math.cos(az_r)
-
         # Strength: peaks at horizon crossing, fades both below and above
         if sun_alt_deg <= 0.0:
             # Twilight: linear ramp from -18° to 0°
@@ -117,14 +411,19 @@ def render_sun(field, sun_alt_deg, sun_az_deg, cx, cy, radius, exposure_s=1.0):
         sky_night_ref = 5.0 * exposure_s
         glow_peak = sky_night_ref * 2.5 * twi
 
-        # Wide diffuse glow (sigma = 28% of radius → ~56° spread)
-        _paint_glow(field, gx, gy, radius * 0.28, SUN_GLOW_COL,  glow_peak)
-        # Narrow bright core (sigma = 10% → ~20° spread)
-        _paint_glow(field, gx, gy, radius * 0.10, SUN_CORONA_COL, glow_peak * 0.5)
+        if glow_peak > GLOW_CUTOFF_PH:
+            # Anchor at horizon edge in solar azimuth
+            r_hor = radius * 0.97
+            gx = cx + r_hor * sin_az
+            gy = cy - r_hor * cos_az
+
+            # Wide diffuse glow (sigma = 28% of radius → ~56° spread)
+            _paint_glow(field, gx, gy, radius * 0.28, SUN_GLOW_COL,  glow_peak)
+            # Narrow bright core (sigma = 10% → ~20° spread)
+            _paint_glow(field, gx, gy, radius * 0.10, SUN_CORONA_COL, glow_peak * 0.5)
 
 
 def _paint_lens_flare(field, px, py, cx, cy, intensity, colour):
-    H, W = field.shape[:2]
     dx = cx - px; dy = cy - py
     dist = math.sqrt(dx*dx + dy*dy)
     if dist < 2: return
@@ -138,8 +437,8 @@ def _paint_lens_flare(field, px, py, cx, cy, intensity, colour):
 # ── Moon ──────────────────────────────────────────────────────────────────────
 
 MOON_ANGULAR_DIAM_DEG = 0.518
-MOON_LIT_COL  = (0.95, 0.92, 0.85)   # sunlit disk — warm grey-white
-MOON_GLOW_COL = (0.80, 0.85, 1.00)   # atmospheric halo — slightly blue
+MOON_LIT_COL  = np.array([0.95, 0.92, 0.85], dtype=np.float32)   # sunlit disk — warm grey-white
+MOON_GLOW_COL = np.array([0.80, 0.85, 1.00], dtype=np.float32)   # atmospheric halo — slightly blue
 
 
 def render_moon(field, moon_alt_deg, moon_az_deg, phase_fraction, phase_angle_deg,
@@ -165,7 +464,7 @@ def render_moon(field, moon_alt_deg, moon_az_deg, phase_fraction, phase_angle_de
     px, py = pos
 
     # Altitude factor (sin) — moon near horizon is dimmer through atmosphere
-    alt_factor = max(0.0, math.sin(math.radians(max(0.0, moon_alt_deg))))
+    alt_factor = max(0.0, math.sin(max(0.0, moon_alt_deg) * _DEG2RAD))
     rel_flux   = phase_fraction * alt_factor
 
     # Disk radius
@@ -196,122 +495,320 @@ def _paint_moon_disk(field, px, py, radius_px, phase_angle_deg, intensity, colou
     phase_angle=90° → quarter (right half lit, waxing)
     phase_angle=180°→ new (all dark)
     """
-    H, W = field.shape[:2]
     R   = max(radius_px, 0.6)
     pad = int(math.ceil(R)) + 2
-    x0=max(0,int(px)-pad); x1=min(W,int(px)+pad+1)
-    y0=max(0,int(py)-pad); y1=min(H,int(py)+pad+1)
-
-    yy, xx = np.mgrid[y0:y1, x0:x1].astype(np.float32)
-    nx = (xx - px) / R
-    ny = (yy - py) / R
-    dr2 = nx**2 + ny**2
-
-    inside = dr2 <= 1.0
-    limb   = np.sqrt(np.clip(1.0 - dr2, 0.0, 1.0))   # limb darkening
+    box = _clip_bbox(field, px, py, pad)
+    if box is None:
+        return
+    x0, x1, y0, y1 = box
 
-    # Terminator: lit side determined by phase_angle
+    # Terminator: lit where side * nx >= k_term * sqrt(1 - ny^2).
     # cos(0°)=+1 → full lit; cos(90°)=0 → half; cos(180°)=-1 → new
-    cos_pa = math.cos(math.radians(phase_angle_deg))
-    ny_safe = np.sqrt(np.clip(1.0 - ny**2, 0.0, 1.0))
-    x_term  = -cos_pa * ny_safe   # terminator x-position at height ny
-
     if phase_angle_deg <= 180.0:
-        lit = nx >= x_term    # waxing: right (east) side lit
+        # waxing: right (east) side lit
+        side, k_term = 1.0, -math.cos(phase_angle_deg * _DEG2RAD)
     else:
-        cos_pa2 = math.cos(math.radians(360.0 - phase_angle_deg))
-        x_term2 = -cos_pa2 * ny_safe
-        lit = nx <= x_term2   # waning: left (west) side lit
+        # waning: left (west) side lit
+        side, k_term = -1.0, math.cos((360.0 - phase_angle_deg) * _DEG2RAD)
 
-    # Subtle mare texture on lit face
-    mare = 0.88 + 0.12 * np.sin(nx * 6.2 + 1.1) * np.cos(ny * 7.8 - 0.4)
+    if _on_device(field):
+        _moon_disk_cuda[_cuda_grid(x0, x1, y0, y1)](
+            field, px, py, R, side, k_term, *_scaled_rgb(colour, intensity),
+            x0, x1, y0, y1)
+        return
+    if HAS_NUMBA:
+        colour = np.asarray(colour, dtype=np.float32)
+        n_bands = _row_bands(x0, x1, y0, y1)
+        if n_bands:
+            _moon_disk_kernel(field, px, py, R, side, k_term, colour,
+                              intensity, x0, x1, y0, y1, n_bands)
+        else:
+            _moon_disk_rows(field, px, py, R, side, k_term, colour,
+                            intensity, x0, x1, y0, y1)
+        return
 
-    mask = inside.astype(np.float32) * lit.astype(np.float32) * limb * mare
-    for c, col in enumerate(colour):
-        field[y0:y1, x0:x1, c] += mask * intensity * col
+    yy, xx = _bbox_grid(x0, x1, y0, y1)
+    inv_r = np.float32(1.0 / R)
+    nx = (xx - px) * inv_r   # (1, w)
+    ny = (yy - py) * inv_r   # (h, 1)
+
+    # Limb darkening, already zero outside the disk; built in place
+    mask = nx**2 + ny**2
+    np.subtract(1.0, mask, out=mask)
+    np.maximum(mask, 0.0, out=mask)
+    np.sqrt(mask, out=mask)
+
+    # Terminator position and the mare texture's row factor depend on ny
+    # only, the texture's column factor on nx only
+    x_term = np.float32(k_term) * np.sqrt(np.clip(1.0 - ny**2, 0.0, 1.0))
+    lit = np.greater_equal(side * nx, x_term)
+    mask *= lit
+
+    # Subtle mare texture on lit face, in a scratch of the same size
+    mare = np.multiply(0.12 * np.sin(nx * 6.2 + 1.1), np.cos(ny * 7.8 - 0.4),
+                       out=np.empty_like(mask))
+    mare += 0.88
+    mask *= mare
+    _add_rgb(field, x0, x1, y0, y1, mask, colour, intensity)
 
 
 # ── Planets & Minor Bodies ────────────────────────────────────────────────────
 
-def render_planet(field, body, cx, cy, radius, exposure_s=1.0):
+# Aperture term handed to mag_to_flux for planets (25mm, as the allsky)
+PLANET_APERTURE = math.pi * 1.25**2
+PLANET_QE = 0.78
+# Planets below this altitude (deg) are not painted
+PLANET_MIN_ALT = 0.5
+# Fewest disjoint bodies worth handing to the painter thread pool
+POOL_MIN_BODIES = 8
+
+
+@dataclass
+class SolarBodiesSoA:
+    """
+    Structure-of-arrays snapshot of the solar bodies for one frame.
+    Every attribute is read once per body here; culling, photometry and
+    projection then run as array operations over the whole list.
+    """
+    bodies:  np.ndarray   # object array of the bodies themselves
+    uid:     np.ndarray   # upper-case uid (object array)
+    alt:     np.ndarray   # altitude (deg)
+    az:      np.ndarray   # azimuth (deg)
+    mag:     np.ndarray   # apparent magnitude
+    bv:      np.ndarray   # B-V, phase-corrected
+    phase:   np.ndarray   # phase angle (deg)
+    diam:    np.ndarray   # apparent diameter (arcsec); 0 unless a paintable planet
+    is_sun:  np.ndarray
+    is_moon: np.ndarray
+
+    @classmethod
+    def from_bodies(cls, solar_bodies) -> "SolarBodiesSoA":
+        rows, objs, uids = [], [], []
+        for body in solar_bodies:
+            try:
+                is_sun = bool(getattr(body, 'is_sun', False))
+                is_moon = bool(getattr(body, 'is_moon', False))
+                alt = body.altitude_deg
+                bv = getattr(body, 'bv_base', None) or getattr(body, 'bv_color', 0.6)
+                # Correzione colore per fase (Venere, Marte)
+                phase = getattr(body, '_phase_angle', 0.0)
+                bv = phase_bv_correction(bv, phase, body.uid)
+                diam = 0.0
+                if not (is_sun or is_moon) and alt >= PLANET_MIN_ALT:
+                    diam = getattr(body, 'apparent_diameter_arcsec', 0.0)
+                    if callable(diam):
+                        diam = diam()
+                rows.append((float(alt), float(body.azimuth_deg),
+                             float(body.apparent_mag), float(bv),
+                             float(phase), float(diam), is_sun, is_moon))
+                objs.append(body); uids.append(body.uid.upper())
+            except Exception:
+                continue   # Non bloccare il render per un singolo corpo
+
+        # One conversion for all numeric columns; the fields are views
+        num = np.array(rows, dtype=np.float64).reshape(len(rows), 8)
+        bodies = np.empty(len(objs), dtype=object)
+        bodies[:] = objs
+        return cls(bodies=bodies, uid=np.array(uids, dtype=object),
+                   alt=num[:, 0], az=num[:, 1], mag=num[:, 2], bv=num[:, 3],
+                   phase=num[:, 4], diam=num[:, 5],
+                   is_sun=num[:, 6] != 0.0, is_moon=num[:, 7] != 0.0)
+
+    def take(self, idx) -> "SolarBodiesSoA":
+        """Subset of the bodies selected by an index or boolean mask."""
+        return SolarBodiesSoA(**{f.name: getattr(self, f.name)[idx]
+                                 for f in fields(self)})
+
+
+def _preprocess_bodies(soa, cx, cy, radius, exposure_s):
+    """
+    Project, colour and flux-calibrate the planets and minor bodies of a
+    SolarBodiesSoA (Sun and Moon are left out) in one vectorised pass,
+    ahead of painting.
+
+    Returns a dict of arrays over the bodies that survive the altitude and
+    flux cuts: 'px', 'py', 'disk_r', 'photons', 'rgb' (N, 3 float32),
+    'mag', 'phase', 'uid' (upper case), plus 'bodies' (object array) for
+    per-body extras such as Saturn's ring geometry.
+    """
+    soa = soa.take((soa.alt >= PLANET_MIN_ALT) & ~(soa.is_sun | soa.is_moon))
+    alt = soa.alt
+    az_r = np.radians(soa.az)
+    mag = soa.mag
+
+    # Flusso fisico in fotoni (stessa pipeline delle stelle), con
+    # estinzione atmosferica standard
+    airmass = 1.0 / np.maximum(np.sin(np.radians(alt)), 0.05)
+    photons = mag_to_flux_array(mag + 0.20 * airmass, PLANET_APERTURE,
+                                exposure_s) * np.float32(PLANET_QE)
+    keep = np.flatnonzero(photons >= 0.01)
+
+    r_px = (90.0 - alt[keep]) / 90.0 * radius
+    az_r = az_r[keep]
+
+    # Diametro apparente in pixel
+    arcsec_per_px = (180.0 * 3600.0) / (2.0 * radius)
+    diam_px = (soa.diam[keep] / arcsec_per_px
+               if arcsec_per_px > 0 else np.zeros(keep.size))
+
+    return {
+        'px':      cx + r_px * np.sin(az_r),
+        'py':      cy - r_px * np.cos(az_r),
+        'disk_r':  np.maximum(diam_px / 2.0, 0.5),
+        'photons': photons[keep],
+        'rgb':     bv_to_rgb_array(soa.bv[keep]),
+        'mag':     mag[keep],
+        'phase':   soa.phase[keep],
+        'uid':     soa.uid[keep],
+        'bodies':  soa.bodies[keep],
+    }
+
+
+def render_planets(field, bodies, cx, cy, radius, exposure_s=1.0):
     """
-    Render a planet or minor body onto the allsky photon field.
+    Render planets and minor bodies onto the allsky photon field.
 
     Usa le magnitudini fisiche accurate da planet_physics.
     Per pianeti con diametro apparente > 1px disegna un disco.
     Per Saturno aggiunge un'ellisse per gli anelli.
     Per Mercurio/Venere applica la maschera di fase.
+
+    bodies: lista di corpi, oppure un SolarBodiesSoA gia' costruito.
     """
-    alt = body.altitude_deg
-    az  = body.azimuth_deg
-    mag = body.apparent_mag
+    if not isinstance(bodies, SolarBodiesSoA):
+        bodies = SolarBodiesSoA.from_bodies(bodies)
+    pre = _preprocess_bodies(bodies, cx, cy, radius, exposure_s)
+    uid, mag, disk_r = pre['uid'], pre['mag'], pre['disk_r']
+
+    # Punti stellari (stelle deboli, oggetti minori, pianeti lontani):
+    # bodies that are neither resolved nor phase-masked are splatted
+    # bilinearly, all in one scatter
+    phased = ((uid == "MERCURY") | (uid == "VENUS")) & (pre['phase'] > 5.0)
+    point = (disk_r < 0.8) & ~phased
+    if point.any():
+        _add_points(field, pre['px'][point], pre['py'][point],
+                    pre['photons'][point, None] * pre['rgb'][point])
+
+    # Only disks, rings and halos of bright points remain per body
+    todo = np.flatnonzero(~point | (mag < 2.0) | (uid == "SATURN"))
+    jobs = list(zip(pre['bodies'][todo], uid[todo], pre['px'][todo].tolist(),
+                    pre['py'][todo].tolist(), disk_r[todo].tolist(),
+                    pre['photons'][todo].tolist(), pre['rgb'][todo],
+                    mag[todo].tolist(), pre['phase'][todo].tolist()))
+
+    # Bodies with small boxes that overlap no other box can be painted
+    # concurrently straight into their own slices of the field
+    pooled = np.zeros(len(jobs), dtype=bool)
+    if (HAS_NUMBA and len(jobs) >= POOL_MIN_BODIES
+            and numba.get_num_threads() > 1 and not _on_device(field)):
+        t_mag = mag[todo]
+        pad = np.where(point[todo],
+                       np.ceil(4.0 * np.maximum(0.8, (2.0 - t_mag) * 0.6)),
+                       np.ceil(np.maximum(disk_r[todo], 0.6)) + 2.0)
+        pooled = (_disjoint_small_boxes(pre['px'][todo], pre['py'][todo], pad)
+                  & (uid[todo] != "SATURN"))   # ring extent not known here
+        if pooled.sum() >= POOL_MIN_BODIES:
+            batch = [jobs[i] for i in np.flatnonzero(pooled).tolist()]
+            list(_painter_pool().map(
+                lambda job: _try_paint_planet(field, job, radius), batch))
+        else:
+            pooled[:] = False
 
-    if alt < 0.5:
-        return
-    pos = _altaz_to_xy(alt, az, cx, cy, radius)
-    if pos is None:
-        return
-    px, py = pos
+    for i in np.flatnonzero(~pooled).tolist():
+        _try_paint_planet(field, jobs[i], radius)
 
-    # Colore B-V → RGB
-    from imaging.sky_renderer import bv_to_rgb, mag_to_flux
-    bv = getattr(body, 'bv_base', None) or getattr(body, 'bv_color', 0.6)
-    # Correzione colore per fase (Venere, Marte)
-    from universe.planet_physics import phase_bv_correction
-    phase_deg = getattr(body, '_phase_angle', 0.0)
-    bv = phase_bv_correction(bv, phase_deg, body.uid)
-    rc, gc, bc = bv_to_rgb(bv)
-
-    # Flusso fisico in fotoni (stessa pipeline delle stelle)
-    airmass = 1.0 / max(math.sin(math.radians(alt)), 0.05)
-    ext_mag = 0.20 * airmass   # estinzione atmosferica standard
-    eff_mag = mag + ext_mag
-
-    # Area apertura allsky (cm²) — dal renderer
-    area_cm2 = math.pi * 1.25**2   # 25mm apertura, come allsky
-    photons = mag_to_flux(eff_mag, area_cm2, exposure_s) * 0.78   # QE
-
-    if photons < 0.01:
-        return
 
-    # Diametro apparente in pixel
-    diam_arcsec = getattr(body, 'apparent_diameter_arcsec',
-                           lambda: 0.0)() if callable(
-                           getattr(body, 'apparent_diameter_arcsec', None)
-                           ) else getattr(body, 'apparent_diameter_arcsec', 0.0)
-    arcsec_per_px = (180.0 * 3600.0) / (2.0 * radius)
-    diam_px = diam_arcsec / arcsec_per_px if arcsec_per_px > 0 else 0.0
-    disk_r  = max(diam_px / 2.0, 0.5)
+def _try_paint_planet(field, job, radius):
+    body, uid, px, py, disk_r, photons, colour, mag, phase_deg = job
+    try:
+        _paint_planet(field, body, uid, px, py, disk_r, photons, colour,
+                      mag, phase_deg, radius)
+    except Exception:
+        pass   # Non bloccare il render per un singolo corpo
 
-    uid = getattr(body, 'uid', '').upper()
 
+def _disjoint_small_boxes(px, py, pad):
+    """
+    Mask of the boxes (centre +- pad) that are small enough for the
+    serial painters and overlap no other box.
+    """
+    small = (2.0 * pad + 1.0)**2 < PARALLEL_MIN_PIXELS
+    gap = pad[:, None] + pad[None, :] + 2.0
+    apart = ((np.abs(px[:, None] - px[None, :]) > gap)
+             | (np.abs(py[:, None] - py[None, :]) > gap))
+    np.fill_diagonal(apart, True)
+    return small & apart.all(axis=1)
+
+
+# Thread pool for painting bodies concurrently, created on first use
+_pool = None
+
+
+def _painter_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=numba.get_num_threads(),
+                                   thread_name_prefix="solar-paint")
+    return _pool
+
+
+def render_planet(field, body, cx, cy, radius, exposure_s=1.0):
+    """Render a single planet or minor body (see render_planets)."""
+    render_planets(field, (body,), cx, cy, radius, exposure_s)
+
+
+def _add_points(field, px, py, rgb_photons):
+    """
+    Add (N, 3) photons at sub-pixel positions (px, py), split bilinearly
+    over the four surrounding pixels so faint bodies move smoothly
+    instead of jumping between pixels. Corners off the field are
+    skipped; np.add.at accumulates bodies that share a pixel.
+    """
+    H, W = field.shape[:2]
+    fx0 = np.floor(px); fy0 = np.floor(py)
+    fx = (px - fx0)[:, None]; fy = (py - fy0)[:, None]
+    ix0 = fx0.astype(np.intp); iy0 = fy0.astype(np.intp)
+    ix = np.concatenate((ix0, ix0 + 1, ix0, ix0 + 1))
+    iy = np.concatenate((iy0, iy0, iy0 + 1, iy0 + 1))
+    rgb = np.concatenate(((1.0 - fx) * (1.0 - fy) * rgb_photons,
+                          fx * (1.0 - fy) * rgb_photons,
+                          (1.0 - fx) * fy * rgb_photons,
+                          fx * fy * rgb_photons)).astype(np.float32)
+    valid = (ix >= 0) & (ix < W) & (iy >= 0) & (iy < H)
+    if _on_device(field):
+        n = int(valid.sum())
+        if n:
+            _points_cuda[(n + 127) // 128, 128](
+                field, cuda.to_device(ix[valid]), cuda.to_device(iy[valid]),
+                cuda.to_device(rgb[valid]))
+        return
+    np.add.at(field, (iy[valid], ix[valid]), rgb[valid])
+
+
+def _paint_planet(field, body, uid, px, py, disk_r, photons, colour, mag,
+                  phase_deg, radius):
+    """
+    Paint one preprocessed body: rings, then disk or phase disk, or the
+    halo of a bright point (the point itself goes through _add_points).
+    """
     # ── Saturno: ellisse anelli ───────────────────────────────────────────
     if uid == "SATURN":
         B_deg = getattr(body, 'ring_inclination_B', 0.0)
         _paint_saturn_rings(field, px, py, disk_r, B_deg,
                             body._distance_au, radius, photons * 0.7,
-                            (rc, gc, bc))
+                            colour)
 
     # ── Disco pianeta ─────────────────────────────────────────────────────
     if uid in ("MERCURY", "VENUS") and phase_deg > 5.0:
         # Fase visibile: usa maschera di fase
-        _paint_moon_disk(field, px, py, disk_r, phase_deg, photons, (rc, gc, bc))
+        _paint_moon_disk(field, px, py, disk_r, phase_deg, photons, colour)
     elif disk_r >= 0.8:
         # Disco risolvibile (Giove, Saturno, Marte vicino)
-        colour = (rc, gc, bc)
         _paint_disk(field, px, py, disk_r, colour, photons)
-    else:
-        # Punto stellare (stelle deboli, oggetti minori, pianeti lontani)
-        H, W = field.shape[:2]
-        ix = int(round(px)); iy = int(round(py))
-        if 0 <= iy < H and 0 <= ix < W:
-            field[iy, ix, 0] += photons * rc
-            field[iy, ix, 1] += photons * gc
-            field[iy, ix, 2] += photons * bc
+    elif mag < 2.0:
         # Alone per pianeti brillanti (mag < 2)
-        if mag < 2.0:
-            glow_s = max(0.8, (2.0 - mag) * 0.6)
-            _paint_glow(field, px, py, glow_s, (rc, gc, bc), photons * 0.15)
+        glow_s = max(0.8, (2.0 - mag) * 0.6)
+        _paint_glow(field, px, py, glow_s, colour, photons * 0.15)
 
 
 def _paint_saturn_rings(field, px, py, disk_r_px, B_deg,
@@ -320,35 +817,46 @@ def _paint_saturn_rings(field, px, py, disk_r_px, B_deg,
     Disegna gli anelli di Saturno come ellisse.
     B_deg: inclinazione (0=taglio, 26.7=massima apertura).
     """
-    from universe.planet_physics import (SATURN_RING_OUTER_KM,
-                                          _KM_PER_AU, _ARCSEC_PER_RAD)
     ring_au   = SATURN_RING_OUTER_KM / _KM_PER_AU
     ring_arcsec = (ring_au / max(distance_au, 0.1)) * _ARCSEC_PER_RAD
     arcsec_per_px = (180.0 * 3600.0) / (2.0 * render_radius)
     ring_a = ring_arcsec / arcsec_per_px       # semiasse maggiore (px)
-    ring_b = ring_a * abs(math.sin(math.radians(B_deg)))  # semiasse minore
+    ring_b = ring_a * abs(math.sin(B_deg * _DEG2RAD))  # semiasse minore
 
     if ring_a < 0.5:
         return
 
-    H, W = field.shape[:2]
     pad = int(math.ceil(ring_a)) + 2
-    x0 = max(0, int(px)-pad); x1 = min(W, int(px)+pad+1)
-    y0 = max(0, int(py)-pad); y1 = min(H, int(py)+pad+1)
-    yy, xx = np.mgrid[y0:y1, x0:x1].astype(np.float32)
+    box = _clip_bbox(field, px, py, pad)
+    if box is None:
+        return
+    x0, x1, y0, y1 = box
+    # An edge-on ring has no dy term
+    inv_a = 1.0 / max(ring_a, 0.1)
+    inv_b = 1.0 / ring_b if ring_b > 0.1 else 0.0
+    if _on_device(field):
+        _rings_cuda[_cuda_grid(x0, x1, y0, y1)](
+            field, px, py, inv_a, inv_b, *_scaled_rgb(colour, intensity * 0.6),
+            x0, x1, y0, y1)
+        return
+    yy, xx = _bbox_grid(x0, x1, y0, y1)
 
-    dx_ = (xx - px) / max(ring_a, 0.1)
-    dy_ = (yy - py) / max(ring_b, 0.1) if ring_b > 0.1 else np.zeros_like(dx_)
-    ell  = dx_**2 + dy_**2
+    # Ellipse distance from the 1-D terms
+    ell = ((xx - px) * np.float32(inv_a))**2
+    if inv_b:
+        ell = ell + ((yy - py) * np.float32(inv_b))**2
 
-    # Anello: corona tra raggio interno (0.6×) e esterno (1.0×)
-    ring_mask = ((ell >= 0.35) & (ell <= 1.0)).astype(np.float32)
-    # Sfuma i bordi
-    ring_mask *= np.clip(1.0 - (ell - 0.35) / 0.05, 0, 1) + np.clip(1.0 - (1.0 - ell) / 0.05, 0, 1)
-    ring_mask = np.clip(ring_mask, 0, 1)
+    # Anello: corona tra raggio interno (0.6×) e esterno (1.0×), bordi
+    # sfumati su 0.05 in ell: rampa interna 0.30→0.35, esterna 0.95→1.00
+    ring_mask = np.subtract(ell, 0.30)
+    ring_mask *= 20.0
+    np.clip(ring_mask, 0.0, 1.0, out=ring_mask)
+    np.subtract(1.0, ell, out=ell)
+    ell *= 20.0
+    np.clip(ell, 0.0, 1.0, out=ell)
+    ring_mask *= ell
 
-    for c, col in enumerate(colour):
-        field[y0:y1, x0:x1, c] += ring_mask * intensity * 0.6 * col
+    _add_rgb(field, x0, x1, y0, y1, ring_mask, colour, intensity * 0.6)
 
 
 # ── Dispatcher aggiornato ─────────────────────────────────────────────────────
@@ -358,17 +866,13 @@ def render_solar_bodies(field, solar_bodies, cx, cy, radius, exposure_s=1.0):
     Render all Solar System bodies: Sun, Moon, planets, minor bodies.
     solar_bodies: lista di OrbitalBody e/o MinorBody/CometBody.
     """
-    for body in solar_bodies:
-        if body.is_sun:
-            render_sun(field, body.altitude_deg, body.azimuth_deg,
-                       cx, cy, radius, exposure_s)
-        elif body.is_moon:
-            render_moon(field, body.altitude_deg, body.azimuth_deg,
-                        body.phase_fraction, body._phase_angle,
-                        cx, cy, radius, exposure_s)
-        else:
-            # Pianeti e oggetti minori
-            try:
-                render_planet(field, body, cx, cy, radius, exposure_s)
-            except Exception:
-                pass   # Non bloccare il render per un singolo corpo
+    soa = SolarBodiesSoA.from_bodies(solar_bodies)
+    for i in np.flatnonzero(soa.is_sun).tolist():
+        render_sun(field, soa.alt[i], soa.az[i], cx, cy, radius, exposure_s)
+    for i in np.flatnonzero(soa.is_moon).tolist():
+        phase = soa.phase[i]
+        phase_fraction = (1.0 + math.cos(phase * _DEG2RAD)) / 2.0
+        render_moon(field, soa.alt[i], soa.az[i], phase_fraction, phase,
+                    cx, cy, radius, exposure_s)
+    # Pianeti e oggetti minori
+    render_planets(field, soa, cx, cy, radius, exposure_s)
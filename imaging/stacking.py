@@ -8,11 +8,287 @@ Implements frame alignment and stacking algorithms:
 - Simple star-based alignment
 """
 
+import math
+import os
+import zlib
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List, Optional, Tuple
+from statistics import fmean
+from typing import List, Optional, Sequence, Tuple
 from .frames import Frame
-from scipy.ndimage import shift as scipy_shift
+from .star_splat import HAS_CUDA, HAS_NUMBA
+from scipy import fft as sp_fft
+from scipy.ndimage import maximum_filter, shift as scipy_shift
+from scipy.spatial import cKDTree
+
+if HAS_NUMBA:
+    import numba
+
+try:
+    import bottleneck as bn
+    HAS_BOTTLENECK = True
+except ImportError:
+    HAS_BOTTLENECK = False
+
+
+# Sigma clipping keeps, per pixel, the running intersection [lo, hi] of
+# every iteration's acceptance band: a value rejected once stays
+# rejected, so "live" is simply lo <= value <= hi and no per-frame mask
+# is needed.
+
+# Pixels per tile of the sigma-clip kernel. The stack stays (N, P) as
+# np.stack builds it; each tile reads a contiguous run of every frame,
+# so the per-pixel reductions never stride across whole frames (and no
+# transposed copy is needed).
+_CLIP_TILE = 512
+# Pixels per median call in stack_median
+_MEDIAN_TILE = 65536
+# Frames summed in float32 before folding into the float64 total
+_MEAN_CHUNK = 16
+
+if HAS_NUMBA:
+    # No fastmath: the open band starts at +-inf
+    @numba.njit(cache=True, parallel=True)
+    def _sigma_clip_kernel(stack, sigma_low, sigma_high, iterations):
+        # stack: (N, P) float32, one column per pixel
+        n, n_pix = stack.shape
+        out = np.zeros(n_pix, dtype=np.float32)
+        n_tiles = (n_pix + _CLIP_TILE - 1) // _CLIP_TILE
+        for t in numba.prange(n_tiles):
+            p0 = t * _CLIP_TILE
+            m = min(n_pix, p0 + _CLIP_TILE) - p0
+            lo = np.full(m, -np.inf)
+            hi = np.full(m, np.inf)
+            s = np.empty(m)
+            s2 = np.empty(m)
+            cnt = np.empty(m)
+            for _ in range(iterations):
+                s[:] = 0.0
+                s2[:] = 0.0
+                cnt[:] = 0.0
+                for i in range(n):
+                    for j in range(m):
+                        # float64 sample: s2/cnt - mean^2 cancels to 0 in
+                        # float32 at real ADU levels, collapsing the band
+                        v = np.float64(stack[i, p0 + j])
+                        if lo[j] <= v and v <= hi[j]:
+                            s[j] += v
+                            s2[j] += v * v
+                            cnt[j] += 1.0
+                for j in range(m):
+                    if cnt[j] > 0.0:
+                        mean = s[j] / cnt[j]
+                        std = np.sqrt(max(s2[j] / cnt[j] - mean * mean, 0.0))
+                        lo[j] = max(lo[j], mean - sigma_low * std)
+                        hi[j] = min(hi[j], mean + sigma_high * std)
+            s[:] = 0.0
+            cnt[:] = 0.0
+            for i in range(n):
+                for j in range(m):
+                    v = np.float64(stack[i, p0 + j])
+                    if lo[j] <= v and v <= hi[j]:
+                        s[j] += v
+                        cnt[j] += 1.0
+            for j in range(m):
+                if cnt[j] > 0.0:
+                    out[p0 + j] = s[j] / cnt[j]
+        return out
+
+
+if HAS_CUDA:
+    from numba import cuda
+
+    # Below this many pixels the host<->device copy of the stack costs
+    # more than the CPU kernel, so the CUDA kernel is only used above it.
+    CUDA_MIN_CLIP_PIXELS = 1 << 20
+    _CUDA_CLIP_THREADS = 256
+
+    @cuda.jit
+    def _sigma_clip_cuda(stack, sigma_low, sigma_high, iterations, out):
+        # One thread per pixel, same running band as _sigma_clip_kernel.
+        # Adjacent threads read adjacent pixels of each frame, so every
+        # row read is coalesced. float64 sums: s2/n - mean^2 cancels
+        # badly in float32.
+        j = cuda.grid(1)
+        n, n_pix = stack.shape
+        if j >= n_pix:
+            return
+        lo = -math.inf
+        hi = math.inf
+        for _ in range(iterations):
+            s = 0.0
+            s2 = 0.0
+            cnt = 0.0
+            for i in range(n):
+                v = float(stack[i, j])
+                if lo <= v and v <= hi:
+                    s += v
+                    s2 += v * v
+                    cnt += 1.0
+            if cnt > 0.0:
+                mean = s / cnt
+                std = math.sqrt(max(s2 / cnt - mean * mean, 0.0))
+                lo = max(lo, mean - sigma_low * std)
+                hi = min(hi, mean + sigma_high * std)
+        s = 0.0
+        cnt = 0.0
+        for i in range(n):
+            v = float(stack[i, j])
+            if lo <= v and v <= hi:
+                s += v
+                cnt += 1.0
+        out[j] = s / cnt if cnt > 0.0 else 0.0
+
+    def _sigma_clip_gpu(stack, sigma_low, sigma_high, iterations):
+        n_pix = stack.shape[1]
+        out = cuda.device_array(n_pix, dtype=np.float32)
+        blocks = (n_pix + _CUDA_CLIP_THREADS - 1) // _CUDA_CLIP_THREADS
+        _sigma_clip_cuda[blocks, _CUDA_CLIP_THREADS](
+            cuda.to_device(stack), sigma_low, sigma_high, iterations, out)
+        return out.copy_to_host()
+
+
+def _median_axis0(block):
+    """
+    Median over axis 0 of an (N, P) block. bottleneck's median when
+    installed; otherwise a single np.partition around the middle
+    element(s), without np.median's extra copies and NaN bookkeeping.
+    """
+    if HAS_BOTTLENECK:
+        return bn.median(block, axis=0)
+    n = block.shape[0]
+    k = n // 2
+    part = np.partition(block, k, axis=0)
+    if n % 2:
+        return part[k]
+    # Even N: the lower middle element is the largest of the lower half
+    return (part[:k].max(axis=0) + part[k]) * 0.5
+
+
+def _median_inplace(values: np.ndarray) -> float:
+    """Median of a scratch array, which may be reordered in place"""
+    if HAS_BOTTLENECK:
+        return float(bn.median(values))
+    return float(np.median(values, overwrite_input=True))
+
+
+def _sigma_clip_numpy(stack, sigma_low, sigma_high, iterations):
+    """Vectorised fallback of _sigma_clip_kernel over an (N, P) stack."""
+    lo = np.full(stack.shape[1], -np.inf)
+    hi = np.full(stack.shape[1], np.inf)
+    for _ in range(iterations):
+        live = (stack >= lo) & (stack <= hi)
+        cnt = live.sum(axis=0)
+        vals = np.where(live, stack, 0.0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = vals.sum(axis=0) / cnt
+            std = np.sqrt(np.maximum((vals * vals).sum(axis=0) / cnt
+                                     - mean * mean, 0.0))
+        # Pixels with nothing left keep their band (NaN compares False)
+        lo = np.fmax(lo, mean - sigma_low * std)
+        hi = np.fmin(hi, mean + sigma_high * std)
+    live = (stack >= lo) & (stack <= hi)
+    cnt = live.sum(axis=0)
+    total = np.where(live, stack, 0.0).sum(axis=0, dtype=np.float64)
+    return np.where(cnt > 0, total / np.maximum(cnt, 1), 0.0).astype(np.float32)
+
+
+def _is_local_max(image: np.ndarray, ys: np.ndarray, xs: np.ndarray,
+                  half: int, scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Mask of the pixels (ys, xs) that equal the maximum of their
+    (2*half+1)^2 window, as image == maximum_filter(image, size) would
+    give there. Sparse candidates gather their windows directly (the
+    window is clipped at the border, same as maximum_filter's default
+    'reflect'); dense ones run the full filter.
+    """
+    h, w = image.shape
+    if len(ys) * (2 * half + 1) ** 2 > image.size:
+        local_max = maximum_filter(image, size=2 * half + 1, output=scratch)
+        return image[ys, xs] == local_max[ys, xs]
+    
+    values = image[ys, xs]
+    keep = np.ones(len(ys), dtype=bool)
+    for oy in range(-half, half + 1):
+        rows = np.clip(ys + oy, 0, h - 1)
+        for ox in range(-half, half + 1):
+            if oy or ox:
+                keep &= image[rows, np.clip(xs + ox, 0, w - 1)] <= values
+    return keep
+
+
+def _parabolic_offset(left: float, centre: float, right: float) -> float:
+    """Vertex of the parabola through three equally spaced samples,
+    relative to the centre one (0 when they are collinear)."""
+    denom = left - 2.0 * centre + right
+    if denom >= 0.0:
+        return 0.0
+    return 0.5 * (left - right) / denom
+
+
+def _peak_shift(correlation: np.ndarray) -> Tuple[float, float]:
+    """
+    (dx, dy) of the peak of a circular correlation map, with indices
+    past the middle wrapped to negative shifts and a parabolic
+    sub-pixel refinement along each axis.
+    """
+    peak_y, peak_x = np.unravel_index(np.argmax(correlation), correlation.shape)
+    ry, rx = correlation.shape
+    dy = peak_y - ry if peak_y > ry // 2 else peak_y
+    dx = peak_x - rx if peak_x > rx // 2 else peak_x
+    
+    # Parabola through the peak and its (circular) neighbours
+    dy += _parabolic_offset(correlation[(peak_y - 1) % ry, peak_x],
+                            correlation[peak_y, peak_x],
+                            correlation[(peak_y + 1) % ry, peak_x])
+    dx += _parabolic_offset(correlation[peak_y, (peak_x - 1) % rx],
+                            correlation[peak_y, peak_x],
+                            correlation[peak_y, (peak_x + 1) % rx])
+    return float(dx), float(dy)
+
+
+def _shift_integer(data: np.ndarray, dy: int, dx: int,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Integer shift with zero fill (same convention as scipy's shift with
+    mode='constant'): one slice copy into a zeroed buffer, no wrap-around
+    """
+    h, w = data.shape[:2]
+    dy = max(-h, min(h, dy))
+    dx = max(-w, min(w, dx))
+    
+    if out is None:
+        out = np.zeros_like(data)
+    else:
+        out.fill(0)
+    np.copyto(out[max(0, dy):h - max(0, -dy), max(0, dx):w - max(0, -dx)],
+              data[max(0, -dy):h - max(0, dy), max(0, -dx):w - max(0, dx)])
+    return out
+
+
+def _shift_one(frame: Frame, shift: Tuple[float, float],
+               subpixel: bool, out: np.ndarray) -> np.ndarray:
+    """Shift one frame's data into out (the body of align_frames)"""
+    dx, dy = shift
+    if subpixel:
+        # Use scipy's shift with interpolation
+        return scipy_shift(frame.data, shift=(dy, dx), output=out,
+                           order=1, mode='constant', cval=0)
+    # Integer pixel shift (fast)
+    return _shift_integer(frame.data, int(round(dy)), int(round(dx)), out)
+
+
+# Thread pool for align_frames, created on first use
+_pool = None
+
+
+def _align_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=os.cpu_count(),
+                                   thread_name_prefix="align")
+    return _pool
 
 
 class StackMethod(Enum):
@@ -31,7 +307,9 @@ class StackingEngine:
     
     def __init__(self):
         """Initialize stacking engine"""
-        pass
+        # Last reference-region spectrum of estimate_shifts, as
+        # (key, checksum, spectrum): a single entry, holding no pixel data
+        self._ref_fft_cache: Optional[tuple] = None
     
     @staticmethod
     def stack_mean(frames: List[Frame]) -> np.ndarray:
@@ -50,10 +328,47 @@ class StackingEngine:
         if not frames:
             raise ValueError("No frames to stack")
         
-        stack = np.stack([f.data for f in frames], axis=0)
-        result = np.mean(stack, axis=0).astype(np.float32)
+        return StackingEngine.stack_mean_streaming(frames)
+    
+    @staticmethod
+    def stack_mean_streaming(frames: Sequence[Frame]) -> np.ndarray:
+        """
+        Mean stacking with a single running-sum accumulator
+        
+        Frames are visited one at a time, so memory is O(H·W) whatever N
+        is: frames may be loaded lazily by the sequence.
+        
+        Args:
+            frames: Sequence of frames to stack
+            
+        Returns:
+            Stacked image
+        """
+        # float32 partial sums (half the bandwidth of a float64
+        # accumulator), folded into float64 every _MEAN_CHUNK frames so
+        # long stacks keep their precision
+        part = None
+        total = None
+        n = 0
+        for f in frames:
+            if part is None:
+                part = np.zeros(f.data.shape, dtype=np.float32)
+            np.add(part, f.data, out=part, casting='unsafe')
+            n += 1
+            if n % _MEAN_CHUNK == 0:
+                if total is None:
+                    total = np.zeros(part.shape, dtype=np.float64)
+                np.add(total, part, out=total)
+                part.fill(0.0)
+        if part is None:
+            raise ValueError("No frames to stack")
         
-        return result
+        if total is None:
+            part *= np.float32(1.0 / n)
+            return part
+        np.add(total, part, out=total)
+        total /= n
+        return total.astype(np.float32)
     
     @staticmethod
     def stack_median(frames: List[Frame]) -> np.ndarray:
@@ -73,9 +388,18 @@ class StackingEngine:
             raise ValueError("No frames to stack")
         
         stack = np.stack([f.data for f in frames], axis=0)
-        result = np.median(stack, axis=0).astype(np.float32)
-        
-        return result
+        shape = stack.shape[1:]
+        stack = stack.reshape(len(frames), -1)
+        
+        # Reduce a cache-sized run of pixels at a time: the median
+        # copies and partitions its input, and on whole frames that
+        # traffic strides across every frame of the stack
+        result = np.empty(stack.shape[1], dtype=np.float32)
+        for p in range(0, stack.shape[1], _MEDIAN_TILE):
+            result[p:p + _MEDIAN_TILE] = _median_axis0(
+                stack[:, p:p + _MEDIAN_TILE])
+        
+        return result.reshape(shape)
     
     @staticmethod
     def stack_sigma_clip(frames: List[Frame],
@@ -101,28 +425,84 @@ class StackingEngine:
             raise ValueError("No frames to stack")
         
         stack = np.stack([f.data for f in frames], axis=0)
-        n_frames = len(frames)
+        shape = stack.shape[1:]
+        stack = stack.reshape(len(frames), -1)
+        
+        # Single pass per iteration over each pixel's samples: running
+        # sum, sum of squares and live count, no masked arrays
+        if HAS_CUDA and stack.shape[1] >= CUDA_MIN_CLIP_PIXELS:
+            result = _sigma_clip_gpu(stack, float(sigma_low),
+                                     float(sigma_high), int(iterations))
+        elif HAS_NUMBA:
+            result = _sigma_clip_kernel(stack, float(sigma_low),
+                                        float(sigma_high), int(iterations))
+        else:
+            result = _sigma_clip_numpy(stack, sigma_low, sigma_high, iterations)
         
-        # Start with all pixels valid
-        mask = np.ones_like(stack, dtype=bool)
+        return result.reshape(shape)
+    
+    @staticmethod
+    def stack_sigma_clip_streaming(frames: Sequence[Frame],
+                                   sigma_low: float = 3.0,
+                                   sigma_high: float = 3.0,
+                                   iterations: int = 1) -> np.ndarray:
+        """
+        Sigma-clipped mean stacking without materialising the (N, H, W) stack
         
-        for _ in range(iterations):
-            # Compute mean and std of non-masked pixels
-            masked_stack = np.ma.array(stack, mask=~mask)
-            mean = np.ma.mean(masked_stack, axis=0)
-            std = np.ma.std(masked_stack, axis=0)
-            
-            # Update mask: reject pixels outside sigma range
-            for i in range(n_frames):
-                low_outlier = stack[i] < (mean - sigma_low * std)
-                high_outlier = stack[i] > (mean + sigma_high * std)
-                mask[i] = mask[i] & ~low_outlier & ~high_outlier
+        Same running-band rejection as stack_sigma_clip, but the frames
+        are read once per pass (iterations + 1 passes) and only per-pixel
+        accumulators are kept: memory is O(H·W) whatever N is. The
+        sequence must be re-iterable; it may load frames lazily.
         
-        # Final mean of non-rejected pixels
-        masked_stack = np.ma.array(stack, mask=~mask)
-        result = np.ma.mean(masked_stack, axis=0).filled(0).astype(np.float32)
+        Args:
+            frames: Sequence of frames to stack
+            sigma_low: Lower sigma threshold for rejection
+            sigma_high: Upper sigma threshold for rejection
+            iterations: Number of clipping iterations
+            
+        Returns:
+            Stacked image
+        """
+        if not frames:
+            raise ValueError("No frames to stack")
         
-        return result
+        shape = frames[0].data.shape
+        lo = np.full(shape, -np.inf, dtype=np.float32)
+        hi = np.full(shape, np.inf, dtype=np.float32)
+        s = np.empty(shape, dtype=np.float64)
+        s2 = np.empty(shape, dtype=np.float64)
+        cnt = np.empty(shape, dtype=np.int32)
+        live = np.empty(shape, dtype=bool)
+        sq = np.empty(shape, dtype=np.float64)
+        
+        for it in range(iterations + 1):
+            last = it == iterations
+            s.fill(0.0)
+            s2.fill(0.0)
+            cnt.fill(0)
+            for f in frames:
+                np.greater_equal(f.data, lo, out=live)
+                live &= f.data <= hi
+                np.add(s, f.data, out=s, where=live)
+                np.add(cnt, 1, out=cnt, where=live)
+                if not last:
+                    np.multiply(f.data, f.data, out=sq, dtype=np.float64)
+                    np.add(s2, sq, out=s2, where=live)
+            
+            with np.errstate(invalid='ignore', divide='ignore'):
+                np.divide(s, cnt, out=s)
+                if last:
+                    break
+                np.divide(s2, cnt, out=s2)
+                # s2 <- std
+                s2 -= s * s
+                np.maximum(s2, 0.0, out=s2)
+                np.sqrt(s2, out=s2)
+                # Pixels with nothing left keep their band (NaN compares False)
+                np.fmax(lo, s - sigma_low * s2, out=lo, casting='unsafe')
+                np.fmin(hi, s + sigma_high * s2, out=hi, casting='unsafe')
+        
+        return np.where(cnt > 0, s, 0.0).astype(np.float32)
     
     @staticmethod
     def stack(frames: List[Frame], method: StackMethod = StackMethod.MEAN) -> np.ndarray:
@@ -145,15 +525,17 @@ class StackingEngine:
         else:
             raise ValueError(f"Unknown stacking method: {method}")
     
-    @staticmethod
-    def estimate_shifts(frames: List[Frame], 
+    def estimate_shifts(self, frames: List[Frame], 
                        reference_idx: int = 0,
                        region_size: int = 256) -> List[Tuple[float, float]]:
         """
         Estimate frame shifts using cross-correlation
         
-        Simple implementation: uses central region of each frame
-        to compute relative shift using phase correlation.
+        Uses the central region of each frame and FFT phase
+        correlation against the reference region. The reference
+        spectrum is cached across calls with the same reference frame
+        and region size (the reference data must not be modified in
+        place between calls).
         
         Args:
             frames: List of frames
@@ -169,40 +551,60 @@ class StackingEngine:
         reference = frames[reference_idx].data
         h, w = reference.shape
         
-        # Extract central region from reference
+        # Central region of each frame
         cy, cx = h // 2, w // 2
-        r = region_size // 2
-        ref_region = reference[cy-r:cy+r, cx-r:cx+r]
-        
-        shifts = []
-        
-        for frame in frames:
-            if frame is frames[reference_idx]:
-                shifts.append((0.0, 0.0))
-                continue
-            
-            # Extract central region from this frame
-            frame_region = frame.data[cy-r:cy+r, cx-r:cx+r]
-            
-            # Compute cross-correlation using FFT
-            # (simplified version - production code would use phase correlation)
-            from scipy.signal import correlate2d
-            
-            correlation = correlate2d(ref_region, frame_region, mode='same')
-            
-            # Find peak
-            peak_y, peak_x = np.unravel_index(np.argmax(correlation), correlation.shape)
-            
-            # Convert to shift (relative to center)
-            dy = peak_y - r
-            dx = peak_x - r
-            
-            shifts.append((float(dx), float(dy)))
+        r = min(region_size, h, w) // 2
+        others = [i for i, f in enumerate(frames)
+                  if f is not frames[reference_idx]]
+        shifts = [(0.0, 0.0)] * len(frames)
+        if not others:
+            return shifts
+        
+        ref_fft = self._reference_spectrum(frames[reference_idx], region_size)
+        
+        # All other regions in one (N, 2r, 2r) batch: one batched FFT
+        regions = np.stack([frames[i].data[cy-r:cy+r, cx-r:cx+r] for i in others])
+        spectra = sp_fft.rfft2(regions, axes=(-2, -1), workers=-1)
+        
+        # Phase correlation: normalised cross-power spectrum, whose
+        # inverse FFT peaks at the shift. O(R^2 log R) instead of the
+        # O(R^4) spatial correlation
+        cross = ref_fft * np.conj(spectra)
+        cross /= np.abs(cross) + 1e-12
+        correlation = sp_fft.irfft2(cross, s=regions.shape[1:], axes=(-2, -1),
+                                    workers=-1)
+        
+        for i, corr in zip(others, correlation):
+            shifts[i] = _peak_shift(corr)
         
         return shifts
     
-    @staticmethod
-    def align_frames(frames: List[Frame],
+    def _reference_spectrum(self, frame: Frame, region_size: int) -> np.ndarray:
+        """
+        rfft2 of the reference frame's central region, cached
+
+        Only the last reference is kept. The entry is matched on frame id,
+        region size and shape plus a CRC of the region's pixels, so a
+        different frame reusing the id or an in-place edit of the region
+        recomputes the spectrum.
+        """
+        data = frame.data
+        h, w = data.shape
+        cy, cx = h // 2, w // 2
+        r = min(region_size, h, w) // 2
+        region = np.ascontiguousarray(data[cy-r:cy+r, cx-r:cx+r])
+        key = (frame.meta.frame_id, region_size, data.shape, data.dtype.str)
+        checksum = zlib.crc32(region)
+
+        cached = self._ref_fft_cache
+        if cached is not None and cached[0] == key and cached[1] == checksum:
+            return cached[2]
+
+        spectrum = sp_fft.rfft2(region, workers=-1)
+        self._ref_fft_cache = (key, checksum, spectrum)
+        return spectrum
+    
+    def align_frames(self, frames: List[Frame],
                     reference_idx: int = 0,
                     subpixel: bool = False) -> List[Frame]:
         """
@@ -223,30 +625,36 @@ class StackingEngine:
             return []
         
         # Estimate shifts
-        shifts = StackingEngine.estimate_shifts(frames, reference_idx)
-        
-        aligned = []
-        
-        for frame, (dx, dy) in zip(frames, shifts):
-            if abs(dx) < 0.1 and abs(dy) < 0.1:
-                # No shift needed
-                aligned.append(frame)
-                continue
-            
-            # Apply shift
-            if subpixel:
-                # Use scipy's shift with interpolation
-                shifted_data = scipy_shift(frame.data, shift=(dy, dx), 
-                                          order=1, mode='constant', cval=0)
-            else:
-                # Integer pixel shift (fast)
-                shifted_data = np.roll(np.roll(frame.data, int(dy), axis=0), 
-                                      int(dx), axis=1)
-            
-            # Create aligned frame
-            aligned_frame = Frame(shifted_data, frame.meta)
+        shifts = self.estimate_shifts(frames, reference_idx)
+        
+        # Frames that actually move are shifted concurrently: both the
+        # scipy interpolation and the slice copy release the GIL
+        moved = [i for i, (dx, dy) in enumerate(shifts)
+                 if not (abs(dx) < 0.1 and abs(dy) < 0.1)]
+        if not moved:
+            return list(frames)
+        
+        # One float32 (K, H, W) block for every shifted frame, each writing
+        # into its own slice: a single allocation instead of one per frame.
+        # The aligned Frames hold the slices themselves (no copy), so the
+        # block lives as long as any of them
+        block = np.empty((len(moved),) + frames[moved[0]].data.shape,
+                         dtype=np.float32)
+        jobs = [(frames[i], shifts[i], subpixel, out)
+                for i, out in zip(moved, block)]
+        if len(jobs) > 1 and (os.cpu_count() or 1) > 1:
+            list(_align_pool().map(lambda job: _shift_one(*job), jobs))
+        else:
+            for job in jobs:
+                _shift_one(*job)
+        
+        # No shift needed: the frame is used as is
+        aligned = list(frames)
+        for i, shifted_data in zip(moved, block):
+            dx, dy = shifts[i]
+            aligned_frame = Frame(shifted_data, frames[i].meta)
             aligned_frame.add_calibration_step(f"Aligned (dx={dx:.2f}, dy={dy:.2f})")
-            aligned.append(aligned_frame)
+            aligned[i] = aligned_frame
         
         return aligned
     
@@ -293,20 +701,27 @@ class StackingEngine:
         if not frames:
             return 0.0
         
-        # Get SNRs from frames (if available)
-        snrs = [f.meta.snr for f in frames if f.meta.snr is not None]
+        # Get SNRs, signal and noise from frames in one pass; the lists
+        # are short, so stdlib fmean beats wrapping them in ndarrays
+        snrs, signals, noises = [], [], []
+        for f in frames:
+            meta = f.meta
+            if meta.snr is not None:
+                snrs.append(meta.snr)
+            signals.append(meta.mean_adu)
+            noises.append(meta.std_adu)
         
         if not snrs:
             # Estimate SNR from signal/noise
             # SNR ≈ mean / std (rough approximation)
-            mean_signal = np.mean([f.meta.mean_adu for f in frames])
-            mean_noise = np.mean([f.meta.std_adu for f in frames])
+            mean_signal = fmean(signals)
+            mean_noise = fmean(noises)
             if mean_noise > 0:
                 base_snr = mean_signal / mean_noise
             else:
                 base_snr = 10.0  # Default
         else:
-            base_snr = np.mean(snrs)
+            base_snr = fmean(snrs)
         
         improvement = StackingEngine.compute_snr_improvement(len(frames), method)
         
@@ -329,7 +744,7 @@ class AdvancedAligner:
         self.max_stars = 100  # Limit for performance
     
     def detect_stars(self, image: np.ndarray, 
-                    threshold_sigma: float = 5.0) -> List[Tuple[float, float]]:
+                    threshold_sigma: float = 5.0) -> np.ndarray:
         """
         Detect bright stars in image
         
@@ -338,36 +753,42 @@ class AdvancedAligner:
             threshold_sigma: Detection threshold in sigma units
             
         Returns:
-            List of (x, y) star positions
+            (K, 2) float32 array of (x, y) star positions, brightest first
         """
         # Simple star detection using local maxima
-        from scipy.ndimage import maximum_filter
         
-        # Find local maxima
-        local_max = maximum_filter(image, size=5)
-        maxima = (image == local_max)
-        
-        # Threshold
-        median = np.median(image)
-        mad = np.median(np.abs(image - median))
+        # Threshold (MAD). The scratch holds |image - median|; the
+        # median partitions it in place, harmless for the MAD
+        scratch = np.array(image, dtype=np.result_type(image, np.float32))
+        median = _median_inplace(scratch)
+        np.subtract(scratch, median, out=scratch)
+        np.abs(scratch, out=scratch)
+        mad = _median_inplace(scratch)
         sigma = 1.4826 * mad
         threshold = median + threshold_sigma * sigma
         
-        stars = maxima & (image > threshold)
-        
-        # Get positions
-        ys, xs = np.where(stars)
+        # Threshold first, then test only those pixels for being the
+        # maximum of their 5x5 window
+        ys, xs = np.nonzero(image > threshold)
+        keep = _is_local_max(image, ys, xs, half=2, scratch=scratch)
+        ys, xs = ys[keep], xs[keep]
         
-        # Sort by brightness and limit
+        # Brightest max_stars: O(K) partition, then sort only those
         brightnesses = image[ys, xs]
-        indices = np.argsort(brightnesses)[::-1][:self.max_stars]
+        if len(brightnesses) > self.max_stars:
+            top = np.argpartition(brightnesses, -self.max_stars)[-self.max_stars:]
+        else:
+            top = np.arange(len(brightnesses))
+        indices = top[np.argsort(brightnesses[top])[::-1]]
         
-        positions = [(float(xs[i]), float(ys[i])) for i in indices]
+        positions = np.empty((len(indices), 2), dtype=np.float32)
+        positions[:, 0] = xs[indices]
+        positions[:, 1] = ys[indices]
         
         return positions
     
-    def match_stars(self, stars1: List[Tuple[float, float]],
-                   stars2: List[Tuple[float, float]],
+    def match_stars(self, stars1: np.ndarray,
+                   stars2: np.ndarray,
                    tolerance: float = 2.0) -> List[Tuple[int, int]]:
         """
         Match stars between two lists
@@ -376,8 +797,8 @@ class AdvancedAligner:
         matching for robustness.
         
         Args:
-            stars1: Stars in first image
-            stars2: Stars in second image
+            stars1: (K, 2) star positions in first image
+            stars2: (K, 2) star positions in second image
             tolerance: Matching tolerance in pixels
             
         Returns:
@@ -386,34 +807,28 @@ class AdvancedAligner:
         # Simple nearest-neighbor matching
         # TODO: Implement triangle algorithm for robustness
         
-        matches = []
+        if len(stars1) == 0 or len(stars2) == 0:
+            return []
         
-        for i, (x1, y1) in enumerate(stars1):
-            best_j = None
-            best_dist = float('inf')
-            
-            for j, (x2, y2) in enumerate(stars2):
-                dist = np.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-                if dist < best_dist and dist < tolerance:
-                    best_dist = dist
-                    best_j = j
-            
-            if best_j is not None:
-                matches.append((i, best_j))
+        # Nearest neighbour via k-d tree: O(N log M) instead of O(N*M)
+        tree = cKDTree(np.asarray(stars2, dtype=np.float64))
+        dists, idxs = tree.query(np.asarray(stars1, dtype=np.float64), k=1,
+                                 distance_upper_bound=tolerance)
+        mask = dists < tolerance
         
-        return matches
+        return list(zip(np.flatnonzero(mask).tolist(), idxs[mask].tolist()))
     
     def compute_transform(self, 
                          matches: List[Tuple[int, int]],
-                         stars1: List[Tuple[float, float]],
-                         stars2: List[Tuple[float, float]]) -> Optional[np.ndarray]:
+                         stars1: np.ndarray,
+                         stars2: np.ndarray) -> Optional[np.ndarray]:
         """
         Compute transformation matrix from matched stars
         
         Args:
             matches: List of matched star indices
-            stars1: Stars in first image
-            stars2: Stars in second image
+            stars1: (K, 2) star positions in first image
+            stars2: (K, 2) star positions in second image
             
         Returns:
             3x3 transformation matrix (affine), or None if not enough matches
@@ -421,12 +836,13 @@ class AdvancedAligner:
         if len(matches) < 3:
             return None
         
-        # Extract matched positions
-        pts1 = np.array([stars1[i] for i, _ in matches])
-        pts2 = np.array([stars2[j] for _, j in matches])
+        # Extract matched positions: one fancy index per star array
+        idx = np.asarray(matches, dtype=np.intp)
+        pts1 = np.asarray(stars1, dtype=np.float32)[idx[:, 0]]
+        pts2 = np.asarray(stars2, dtype=np.float32)[idx[:, 1]]
         
         # Compute simple translation (could be extended to full affine)
-        translation = np.mean(pts2 - pts1, axis=0)
+        translation = np.mean(pts2 - pts1, axis=0, dtype=np.float64)
         
         # Create affine matrix (translation only for now)
         matrix = np.eye(3)
@@ -0,0 +1,390 @@
+"""
+Star stamp splatting kernels.
+
+Adds PSF stamps for many stars into a photon field in one call.
+PSFs come from a bank: a (n_bands, K, K) float32 array where each band's
+kernel is centred and zero-padded to the largest size, plus the half-size
+of every band.
+
+When Numba is installed the splat runs as a compiled per-pixel loop
+(split over horizontal row bands on multi-core machines); otherwise a
+NumPy slice-add fallback produces the same result. Large star lists go
+to a CUDA kernel instead when Numba can see a GPU.
+
+Faint stars that all share one Gaussian PSF can instead be deposited as
+sub-pixel impulses and blurred once (splat_impulses), with OpenCV's
+GaussianBlur when available and scipy.ndimage otherwise. Crowds of
+bright stars sharing one large kernel can likewise be rendered as a
+delta map blurred once (splat_deltas).
+"""
+
+from __future__ import annotations
+import threading
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+HAS_CUDA = False
+if HAS_NUMBA:
+    try:
+        from numba import cuda
+        HAS_CUDA = cuda.is_available()
+    except Exception:   # no driver / toolkit: CPU paths only
+        HAS_CUDA = False
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# Row bands per thread for the parallel splat: a few per thread keeps
+# the load balanced when stars bunch up in part of the frame.
+_BANDS_PER_THREAD = 4
+
+
+# Below this many stars the host<->device copies of the fields cost more
+# than the CPU splat, so the CUDA kernel is only used above it.
+CUDA_MIN_STARS = 5000
+
+
+# Stamp buffers for the NumPy splat, one per thread and kernel size,
+# reused across calls so a frame allocates nothing per star or per call.
+_scratch = threading.local()
+
+
+def _stamp_scratch(shape) -> np.ndarray:
+    buf = getattr(_scratch, 'buf', None)
+    if buf is None or buf.shape != shape:
+        buf = _scratch.buf = np.empty(shape, dtype=np.float32)
+    return buf
+
+
+def _splat_stamps_numpy(fields, ix, iy, photons, bands, psf_bank, sizes):
+    H, W = fields[0].shape
+    c = psf_bank.shape[1] // 2
+    # Clipped stamp boxes for all stars at once; the loop only slices
+    ix = np.asarray(ix, dtype=np.int64)
+    iy = np.asarray(iy, dtype=np.int64)
+    size = np.asarray(sizes, dtype=np.int64)[bands]
+    y0 = np.maximum(0, iy - size);  y1 = np.minimum(H, iy + size + 1)
+    x0 = np.maximum(0, ix - size);  x1 = np.minimum(W, ix + size + 1)
+    vis = np.flatnonzero((y0 < y1) & (x0 < x1))
+    ky0 = c - (iy - y0);  kx0 = c - (ix - x0)
+    # One reusable stamp buffer: no per-star temporaries or casts. With
+    # several channels it is (C, K, K) and one broadcast multiply builds
+    # every channel's stamp.
+    n_ch = len(fields)
+    if n_ch == 1:
+        scratch = _stamp_scratch(psf_bank.shape[1:])
+        photons = photons[:, 0]
+    else:
+        scratch = _stamp_scratch((n_ch,) + psf_bank.shape[1:])
+        photons = photons[:, :, None, None]
+    for i, b, sy0, sy1, sx0, sx1, sky, skx in zip(
+            vis.tolist(), bands[vis].tolist(),
+            y0[vis].tolist(), y1[vis].tolist(), x0[vis].tolist(), x1[vis].tolist(),
+            ky0[vis].tolist(), kx0[vis].tolist()):
+        h, w = sy1 - sy0, sx1 - sx0
+        stamp = scratch[..., :h, :w]
+        np.multiply(psf_bank[b, sky:sky + h, skx:skx + w], photons[i], out=stamp)
+        if n_ch == 1:
+            fields[0][sy0:sy1, sx0:sx1] += stamp
+        else:
+            for ch in range(n_ch):
+                fields[ch][sy0:sy1, sx0:sx1] += stamp[ch]
+    return len(vis)
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _splat_stamps_jit(fields, ix, iy, photons, bands, psf_bank, sizes):
+        H, W = fields[0].shape
+        n_ch = len(fields)
+        c = psf_bank.shape[1] // 2
+        n_rendered = 0
+        for i in range(ix.shape[0]):
+            b = bands[i]
+            size = sizes[b]
+            x = ix[i]
+            y = iy[i]
+            y0 = max(0, y - size);  y1 = min(H, y + size + 1)
+            x0 = max(0, x - size);  x1 = min(W, x + size + 1)
+            if y0 >= y1 or x0 >= x1:
+                continue
+            # Each PSF sample is read once and added to every channel
+            for yy in range(y0, y1):
+                ky = c + yy - y
+                for xx in range(x0, x1):
+                    w = psf_bank[b, ky, c + xx - x]
+                    for ch in range(n_ch):
+                        fields[ch][yy, xx] += w * photons[i, ch]
+            n_rendered += 1
+        return n_rendered
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _splat_stamps_rows_jit(fields, ix, iy, photons, bands, psf_bank, sizes,
+                               n_chunks):
+        # Stars are sorted by iy. Each chunk owns the rows [r0, r1) of
+        # every field and only writes those rows, so threads never touch
+        # the same pixel and no atomics are needed.
+        H, W = fields[0].shape
+        n_ch = len(fields)
+        c = psf_bank.shape[1] // 2
+        s_max = sizes.max()
+        rows = (H + n_chunks - 1) // n_chunks
+        for k in prange(n_chunks):
+            r0 = k * rows
+            r1 = min(H, r0 + rows)
+            lo = np.searchsorted(iy, r0 - s_max)
+            hi = np.searchsorted(iy, r1 + s_max, side='right')
+            for i in range(lo, hi):
+                b = bands[i]
+                size = sizes[b]
+                x = ix[i]
+                y = iy[i]
+                y0 = max(r0, y - size);  y1 = min(r1, y + size + 1)
+                x0 = max(0, x - size);   x1 = min(W, x + size + 1)
+                if y0 >= y1 or x0 >= x1:
+                    continue
+                for yy in range(y0, y1):
+                    ky = c + yy - y
+                    for xx in range(x0, x1):
+                        w = psf_bank[b, ky, c + xx - x]
+                        for ch in range(n_ch):
+                            fields[ch][yy, xx] += w * photons[i, ch]
+
+
+if HAS_CUDA:
+    @cuda.jit
+    def _splat_stamps_cuda(out, ix, iy, photons, bands, psf_bank, sizes):
+        # One block per star, one thread per kernel pixel; overlapping
+        # stamps meet in global memory, so accumulate atomically.
+        i = cuda.blockIdx.x
+        K = psf_bank.shape[1]
+        ky = cuda.threadIdx.x // K
+        kx = cuda.threadIdx.x - ky * K
+        if ky >= K:
+            return
+        b = bands[i]
+        c = K // 2
+        size = sizes[b]
+        if abs(ky - c) > size or abs(kx - c) > size:
+            return
+        y = iy[i] + ky - c
+        x = ix[i] + kx - c
+        if y < 0 or y >= out.shape[1] or x < 0 or x >= out.shape[2]:
+            return
+        w = psf_bank[b, ky, kx]
+        for ch in range(out.shape[0]):
+            cuda.atomic.add(out, (ch, y, x), w * photons[i, ch])
+
+    # Device copy of the most recent PSF bank (banks are cached and
+    # read-only on the host, so identity is a safe key)
+    _device_bank = [None, None]
+
+    def _splat_stamps_gpu(fields, ix, iy, photons, bands, psf_bank, sizes):
+        if _device_bank[0] is not psf_bank:
+            _device_bank[:] = [psf_bank, cuda.to_device(psf_bank)]
+        H, W = fields[0].shape
+        out = cuda.to_device(np.zeros((len(fields), H, W), dtype=np.float32))
+        K = psf_bank.shape[1]
+        threads = (K * K + 31) // 32 * 32
+        _splat_stamps_cuda[len(ix), threads](
+            out, cuda.to_device(ix), cuda.to_device(iy), cuda.to_device(photons),
+            cuda.to_device(bands), _device_bank[1], cuda.to_device(sizes))
+        host = out.copy_to_host()
+        for c, fld in enumerate(fields):
+            fld += host[c]
+
+
+def _count_overlapping(ix, iy, bands, sizes, H, W) -> int:
+    s = sizes[bands]
+    return int(np.count_nonzero((ix + s >= 0) & (ix - s < W)
+                                & (iy + s >= 0) & (iy - s < H)))
+
+
+def splat_stamps(fields, ix: np.ndarray, iy: np.ndarray,
+                 photons: np.ndarray, bands: np.ndarray,
+                 psf_bank: np.ndarray, sizes: np.ndarray) -> int:
+    """
+    Add one PSF stamp per star into one or more fields (in place).
+
+    Args:
+        fields: Sequence of (H, W) float32 photon fields
+        ix, iy: Integer pixel centre of each star
+        photons: (N, len(fields)) photons of each star per field
+        bands: PSF band index of each star (into psf_bank / sizes)
+        psf_bank: (n_bands, K, K) float32 centred kernels
+        sizes: Half-size of each band's kernel
+
+    Returns:
+        Number of stars whose stamp overlapped the fields
+    """
+    if len(ix) == 0:
+        return 0
+    fields = tuple(fields)
+    photons = np.ascontiguousarray(photons, dtype=np.float32).reshape(len(ix), len(fields))
+    if HAS_NUMBA:
+        ix = np.ascontiguousarray(ix, dtype=np.int64)
+        iy = np.ascontiguousarray(iy, dtype=np.int64)
+        bands = np.ascontiguousarray(bands, dtype=np.int64)
+        sizes = np.ascontiguousarray(sizes, dtype=np.int64)
+        H, W = fields[0].shape
+        if HAS_CUDA and len(ix) >= CUDA_MIN_STARS:
+            _splat_stamps_gpu(fields, ix, iy, photons, bands, psf_bank, sizes)
+            return _count_overlapping(ix, iy, bands, sizes, H, W)
+
+        n_threads = numba.get_num_threads()
+        if n_threads == 1:
+            return int(_splat_stamps_jit(fields, ix, iy, photons, bands,
+                                         psf_bank, sizes))
+
+        order = np.argsort(iy, kind='stable')
+        ix, iy = ix[order], iy[order]
+        photons, bands = photons[order], bands[order]
+        n_chunks = min(H, n_threads * _BANDS_PER_THREAD)
+        _splat_stamps_rows_jit(fields, ix, iy, photons, bands, psf_bank, sizes,
+                               n_chunks)
+        return _count_overlapping(ix, iy, bands, sizes, H, W)
+    return _splat_stamps_numpy(fields, ix, iy, photons, bands, psf_bank, sizes)
+
+
+def _scatter_window(n_ch: int, h: int, w: int, flat: np.ndarray,
+                    weights: np.ndarray) -> np.ndarray:
+    """
+    (n_ch, h, w) float32 window with weights[:, c] summed at the flat
+    pixel indices `flat` of channel c. np.bincount does the scatter-add
+    in one sorted-free pass, several times faster than np.add.at.
+    """
+    window = np.empty((n_ch, h, w), dtype=np.float32)
+    for c in range(n_ch):
+        window[c] = np.bincount(flat, weights[:, c], minlength=h * w).reshape(h, w)
+    return window
+
+
+def _blur_into(fields, impulse: np.ndarray, wx0: int, wy0: int,
+               sigma: float, size: int) -> None:
+    """
+    Blur a (C, h, w) impulse window with the Gaussian truncated at `size`
+    (gaussian_psf(size, sigma)) and add its overlap with the fields,
+    the window's top-left corner being field pixel (wx0, wy0).
+    """
+    if HAS_CV2:
+        # Same truncated, zero-padded kernel as the SciPy path
+        ksize = (2 * size + 1, 2 * size + 1)
+        for c in range(len(fields)):
+            cv2.GaussianBlur(impulse[c], ksize, sigmaX=sigma, sigmaY=sigma,
+                             dst=impulse[c], borderType=cv2.BORDER_CONSTANT)
+    else:
+        from scipy.ndimage import gaussian_filter
+        impulse = gaussian_filter(impulse, sigma=(0, sigma, sigma), mode='constant',
+                                  truncate=size / sigma)
+
+    H, W = fields[0].shape
+    wy1, wx1 = wy0 + impulse.shape[1], wx0 + impulse.shape[2]
+    fx0, fx1 = max(wx0, 0), min(wx1, W)
+    fy0, fy1 = max(wy0, 0), min(wy1, H)
+    if fx0 < fx1 and fy0 < fy1:
+        for c, fld in enumerate(fields):
+            fld[fy0:fy1, fx0:fx1] += impulse[c, fy0 - wy0:fy1 - wy0,
+                                             fx0 - wx0:fx1 - wx0]
+
+
+def splat_impulses(fields, px: np.ndarray, py: np.ndarray,
+                   photons: np.ndarray, sigma: float, size: int) -> int:
+    """
+    Render point sources sharing one Gaussian PSF into one or more fields.
+
+    Photons are deposited bilinearly at (px, py) into an impulse image
+    covering the sources' bounding box (plus the PSF half-size, so
+    off-edge stars still spill in), which is then blurred once with a
+    separable Gaussian truncated at `size`. Equivalent to per-star
+    gaussian_psf(size, sigma) stamps, but costs one filter pass instead
+    of one stamp write per star.
+
+    Args:
+        fields: Sequence of (H, W) float32 fields, updated in place
+        px, py: Sub-pixel star positions
+        photons: (N, len(fields)) photons per star per field
+        sigma: PSF sigma in pixels
+        size: PSF half-size in pixels
+
+    Returns:
+        Number of stars deposited
+    """
+    H, W = fields[0].shape
+    x = np.asarray(px, dtype=np.float64)
+    y = np.asarray(py, dtype=np.float64)
+    x0 = np.floor(x).astype(np.intp)
+    y0 = np.floor(y).astype(np.intp)
+    # Sources whose PSF cannot reach the field are dropped
+    keep = (x0 >= -size - 1) & (x0 <= W + size) & (y0 >= -size - 1) & (y0 <= H + size)
+    if not keep.any():
+        return 0
+    x0, y0 = x0[keep], y0[keep]
+    fx, fy = x[keep] - x0, y[keep] - y0
+    ph = np.asarray(photons, dtype=np.float64)[keep]
+
+    # Impulse window in field coordinates: bounding box + PSF margin
+    wx0, wx1 = int(x0.min()) - size, int(x0.max()) + size + 2
+    wy0, wy1 = int(y0.min()) - size, int(y0.max()) + size + 2
+    h, w = wy1 - wy0, wx1 - wx0
+    base = (y0 - wy0) * w + (x0 - wx0)
+
+    # Bilinear weights of the four neighbouring pixels, scattered at once
+    flat = np.concatenate((base, base + 1, base + w, base + w + 1))
+    wt = np.concatenate(((1 - fx) * (1 - fy), fx * (1 - fy),
+                         (1 - fx) * fy, fx * fy))
+    impulse = _scatter_window(len(fields), h, w, flat,
+                              np.tile(ph, (4, 1)) * wt[:, None])
+
+    _blur_into(fields, impulse, wx0, wy0, sigma, size)
+    return int(keep.sum())
+
+
+def splat_deltas(fields, ix: np.ndarray, iy: np.ndarray,
+                 photons: np.ndarray, sigma: float, size: int) -> int:
+    """
+    Render stars sharing one Gaussian PSF at integer pixel centres.
+
+    Photons are deposited as deltas at (ix, iy) into a map covering the
+    stars' bounding box (plus the PSF half-size), which is blurred once
+    with the separable Gaussian: two 1D passes of 2*size+1 taps per
+    pixel of the window, instead of (2*size+1)^2 writes per star. Same
+    result as per-star gaussian_psf(size, sigma) stamps, so it suits
+    crowded bands of large (bright-star) kernels.
+
+    Args:
+        fields: Sequence of (H, W) float32 fields, updated in place
+        ix, iy: Integer pixel centre of each star
+        photons: (N, len(fields)) photons per star per field
+        sigma: PSF sigma in pixels
+        size: PSF half-size in pixels
+
+    Returns:
+        Number of stars deposited
+    """
+    H, W = fields[0].shape
+    ix = np.asarray(ix, dtype=np.intp)
+    iy = np.asarray(iy, dtype=np.intp)
+    keep = (ix >= -size) & (ix < W + size) & (iy >= -size) & (iy < H + size)
+    if not keep.any():
+        return 0
+    ix, iy = ix[keep], iy[keep]
+    ph = np.asarray(photons, dtype=np.float64)[keep]
+
+    # Delta window in field coordinates: bounding box + PSF margin
+    wx0, wx1 = int(ix.min()) - size, int(ix.max()) + size + 1
+    wy0, wy1 = int(iy.min()) - size, int(iy.max()) + size + 1
+    w = wx1 - wx0
+    delta = _scatter_window(len(fields), wy1 - wy0, w,
+                            (iy - wy0) * w + (ix - wx0), ph)
+
+    _blur_into(fields, delta, wx0, wy0, sigma, size)
+    return int(keep.sum())
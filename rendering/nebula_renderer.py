@@ -4,10 +4,35 @@ Genera texture procedurali deterministiche per nebulose, SNR, ecc.
 """
 
 from __future__ import annotations
+import math
+from collections import OrderedDict
+from functools import lru_cache
 import numpy as np
 import pygame
 from typing import Optional
 from catalogs.deep_sky import DeepSkyObject, DSOType
+from rendering._nebula_kernels import add_hii_blobs, add_snr_filaments
+
+try:
+    import pyfastnoisesimd as fns
+    HAS_FNS = True
+except ImportError:
+    HAS_FNS = False
+
+# Turbolenza delle regioni HII: FBM a 5 ottave
+HII_NOISE_SCALES = [0.02, 0.05, 0.1, 0.2, 0.4]
+HII_NOISE_WEIGHTS = [1.0, 0.6, 0.4, 0.25, 0.15]
+
+if HAS_FNS:
+    # Generatore FBM simplex condiviso (kernel SIMD): per ogni oggetto
+    # cambia solo il seed
+    _FNS = fns.Noise(seed=0, numWorkers=1)
+    _FNS.noiseType = fns.NoiseType.SimplexFractal
+    _FNS.fractal.fractalType = fns.FractalType.FBM
+    _FNS.fractal.octaves = len(HII_NOISE_SCALES)
+    _FNS.fractal.lacunarity = 2.0
+    _FNS.fractal.gain = 0.5
+    _FNS.frequency = 0.02
 
 def splitmix64(x: int) -> int:
     x = (x + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
@@ -26,6 +51,89 @@ def hash_u64(*vals: int) -> int:
 def rng_from_seed(seed_u64: int) -> np.random.Generator:
     return np.random.default_rng(np.uint64(seed_u64))
 
+# Tipo dei campi di densità e delle coordinate. Tutta l'aritmetica resta
+# in questo tipo (scalari Python o math.*, mai scalari float64 di NumPy
+# che promuoverebbero a float64); float16 non conviene su x86, dove NumPy
+# lo emula elemento per elemento (~15x più lento di float32)
+_DENSITY_DTYPE = np.float32
+
+def grid_axes(size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Coordinate y (size, 1) e x (1, size) in _DENSITY_DTYPE: il broadcasting
+    costruisce il 2D solo dentro le espressioni, senza la mesh di mgrid
+    """
+    axis = np.arange(size, dtype=_DENSITY_DTYPE)
+    return axis.reshape(-1, 1), axis.reshape(1, -1)
+
+@lru_cache(maxsize=256)
+def _ellipse_envelope(size: int, angle_q: int, ratio_q: int) -> np.ndarray:
+    """
+    Inviluppo ellittico exp(-r²) delle regioni HII (semiasse maggiore
+    0.45·size), per PA in centesimi di grado e rapporto assi in 1/10000.
+    Array float32 in sola lettura, condiviso fra le chiamate
+    """
+    yy, xx = grid_axes(size)
+    dx = xx - size / 2
+    dy = yy - size / 2
+    r_max = size * 0.45
+    r_min = r_max * max(ratio_q, 1) / 10000
+    angle = math.radians(angle_q / 100)
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    
+    # Rotazione
+    dx_rot = (dx * cos_a - dy * sin_a) / r_max
+    dy_rot = (dx * sin_a + dy * cos_a) / r_min
+    envelope = np.exp(-(dx_rot ** 2 + dy_rot ** 2))
+    envelope.flags.writeable = False
+    return envelope
+
+@lru_cache(maxsize=64)
+def _radial_gaussian(size: int, sigma_frac: float) -> np.ndarray:
+    """
+    Profilo gaussiano centrato exp(-r²/2σ²) con σ = sigma_frac·size.
+    Array float32 in sola lettura, condiviso fra le chiamate
+    """
+    yy, xx = grid_axes(size)
+    r_max = size * sigma_frac
+    profile = np.exp(-((xx - size / 2) ** 2 + (yy - size / 2) ** 2) / (2 * r_max ** 2))
+    profile.flags.writeable = False
+    return profile
+
+# Id interi dei filtri per le chiavi di cache (sconosciuti → RGB, che è
+# anche come vengono resi)
+FILTER_IDS = {"RGB": 0, "Ha": 1, "OIII": 2, "SII": 3, "LRGB": 4, "HOO": 5, "SHO": 6}
+
+# Fattori R, G, B (densità 1 → valore) per filtro; in RGB per tipo di oggetto
+FILTER_PALETTE = {
+    "Ha": (255, 60, 60),        # H-alpha (rosso)
+    "OIII": (80, 255, 180),     # OIII (ciano-verde)
+    "SII": (200, 40, 40),       # SII (rosso scuro)
+    "HOO": (255, 180, 120),     # H-alpha + OIII (Hubble palette style)
+    "SHO": (255, 220, 120),     # Sulphur-Hydrogen-Oxygen (false color)
+}
+TYPE_PALETTE = {
+    "HII": (255, 120, 140),     # HII regions - rosso-rosa
+    "PN": (120, 255, 200),      # Planetarie - verde-blu
+    "SNR": (240, 180, 100),     # SNR - mix rosso-verde
+    "RN": (120, 160, 255),      # Riflessione - blu
+}
+
+def density_to_rgba_surface(density: np.ndarray, rgb: tuple) -> pygame.Surface:
+    """
+    Superficie RGBA da un campo di densità [0-1]: canale c = densità·rgb[c],
+    alpha = densità·255. Un solo buffer uint8 (h, w, 4) riempito canale per
+    canale attraverso un unico scratch float32, poi condiviso dalla
+    superficie senza trasposizione
+    """
+    h, w = density.shape
+    rgba = np.empty((h, w, 4), dtype=np.uint8)
+    scratch = np.empty((h, w), dtype=np.float32)
+    for c, k in enumerate((*rgb, 255)):
+        np.multiply(density, k, out=scratch)
+        rgba[..., c] = scratch
+    
+    return pygame.image.frombuffer(rgba, (w, h), "RGBA")
+
 class NebulaRenderer:
     """
     Renderer procedurale per nebulose in stile pixelart realistico
@@ -33,7 +141,8 @@ class NebulaRenderer:
     """
     
     def __init__(self, cache_size: int = 100):
-        self._cache: dict[int, pygame.Surface] = {}
+        # LRU: ogni accesso sposta la voce in fondo, si elimina dalla testa
+        self._cache: OrderedDict[tuple[int, int, int], pygame.Surface] = OrderedDict()
         self._cache_size = cache_size
         
     def render_nebula(self, obj: DeepSkyObject, 
@@ -50,10 +159,12 @@ class NebulaRenderer:
         Returns:
             pygame.Surface con la nebulosa renderizzata
         """
-        # Check cache
-        cache_key = (obj.id, size_px, filter_mode)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        # Check cache (chiave di soli interi)
+        cache_key = (obj.id, size_px, FILTER_IDS.get(filter_mode, 0))
+        surf = self._cache.get(cache_key)
+        if surf is not None:
+            self._cache.move_to_end(cache_key)
+            return surf
         
         # Genera texture basata sul tipo
         if obj.dso_type == DSOType.HII_REGION:
@@ -69,8 +180,8 @@ class NebulaRenderer:
         
         # Salva in cache
         if len(self._cache) >= self._cache_size:
-            # Rimuovi il più vecchio
-            self._cache.pop(next(iter(self._cache)))
+            # Rimuovi il meno usato di recente
+            self._cache.popitem(last=False)
         self._cache[cache_key] = surf
         
         return surf
@@ -80,55 +191,49 @@ class NebulaRenderer:
         Renderizza regione HII (nebulosa a emissione)
         Struttura filiforme con zone di alta/bassa densità
         """
-        rng = rng_from_seed(hash_u64(obj.id, 0xH11))
-        
-        # Crea campo di densità con noise multi-scala
-        density = np.zeros((size, size), dtype=np.float32)
+        rng = rng_from_seed(hash_u64(obj.id, 0x4111))
         
-        # Noise a diverse scale (turbolenza)
-        scales = [0.02, 0.05, 0.1, 0.2, 0.4]
-        weights = [1.0, 0.6, 0.4, 0.25, 0.15]
+        # Fasi del noise estratte comunque, così i filamenti sotto
+        # sono gli stessi con o senza pyfastnoisesimd
+        phases = rng.uniform(0, 100, 2 * len(HII_NOISE_SCALES))
         
-        yy, xx = np.mgrid[0:size, 0:size]
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
-        for scale, weight in zip(scales, weights):
-            # Perlin-like noise (semplificato)
-            freq = scale
-            phase_x = rng.uniform(0, 100)
-            phase_y = rng.uniform(0, 100)
-            
-            noise = np.sin((xx * freq + phase_x) * 0.1) * np.sin((yy * freq + phase_y) * 0.1)
-            density += noise * weight
+        # Crea campo di densità con noise multi-scala (turbolenza)
+        if HAS_FNS:
+            _FNS.seed = hash_u64(obj.id, 0x4111, 1) & 0x7FFFFFFF
+            density = _FNS.genAsGrid([1, size, size])[0]
+        else:
+            density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
+            for i, (scale, weight) in enumerate(zip(HII_NOISE_SCALES, HII_NOISE_WEIGHTS)):
+                # Perlin-like noise (semplificato)
+                freq = scale
+                phase_x, phase_y = float(phases[2 * i]), float(phases[2 * i + 1])
+                
+                noise = np.sin((xx * freq + phase_x) * 0.1) * np.sin((yy * freq + phase_y) * 0.1)
+                density += noise * weight
         
         # Forma complessiva ellittica
         r_max = size * 0.45
         r_min = r_max * (obj.size_minor_arcmin / obj.size_arcmin)
-        angle = np.radians(obj.pa_deg)
         
-        # Rotazione
-        dx = xx - cx
-        dy = yy - cy
-        dx_rot = dx * np.cos(angle) - dy * np.sin(angle)
-        dy_rot = dx * np.sin(angle) + dy * np.cos(angle)
-        
-        r_ellipse = np.sqrt((dx_rot / r_max)**2 + (dy_rot / r_min)**2)
-        envelope = np.exp(-(r_ellipse ** 2))
+        # Inviluppo (rotazione + exp su size²) condiviso fra oggetti con
+        # stessa size, PA al centesimo di grado e rapporto assi a 1/10000
+        envelope = _ellipse_envelope(size, int(round(obj.pa_deg * 100)),
+                                     int(round(obj.size_minor_arcmin / obj.size_arcmin * 10000)))
         
         density = density * envelope
         density = np.clip(density, 0, 1)
         
-        # Aggiungi filamenti (caratteristico delle HII)
+        # Aggiungi filamenti (caratteristico delle HII): parametri estratti
+        # nello stesso ordine di sempre, poi un solo kernel
         n_filaments = rng.integers(5, 15)
-        for _ in range(n_filaments):
-            fx = rng.uniform(cx - r_max, cx + r_max)
-            fy = rng.uniform(cy - r_min, cy + r_min)
-            fw = rng.uniform(2, 8)
-            strength = rng.uniform(0.3, 0.8)
-            
-            d = np.sqrt((xx - fx)**2 + (yy - fy)**2)
-            filament = np.exp(-(d ** 2) / (2 * fw ** 2)) * strength
-            density += filament * envelope
+        fil = np.array([(rng.uniform(cx - r_max, cx + r_max),
+                         rng.uniform(cy - r_min, cy + r_min),
+                         rng.uniform(2, 8),
+                         rng.uniform(0.3, 0.8)) for _ in range(n_filaments)])
+        add_hii_blobs(density, fil[:, 0], fil[:, 1], fil[:, 2], fil[:, 3], envelope)
         
         density = np.clip(density, 0, 1)
         
@@ -142,11 +247,11 @@ class NebulaRenderer:
         Renderizza nebulosa planetaria
         Struttura simmetrica con shell multipli
         """
-        rng = rng_from_seed(hash_u64(obj.id, 0xP14N))
+        rng = rng_from_seed(hash_u64(obj.id, 0x914E))
         
-        density = np.zeros((size, size), dtype=np.float32)
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
         
-        yy, xx = np.mgrid[0:size, 0:size]
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
         # Shell principale
@@ -173,8 +278,8 @@ class NebulaRenderer:
             lobe_size = rng.uniform(r_outer * 0.3, r_outer * 0.5)
             
             for sign in [-1, 1]:
-                lx = cx + sign * lobe_dist * np.cos(lobe_angle)
-                ly = cy + sign * lobe_dist * np.sin(lobe_angle)
+                lx = cx + sign * lobe_dist * math.cos(lobe_angle)
+                ly = cy + sign * lobe_dist * math.sin(lobe_angle)
                 d = np.sqrt((xx - lx)**2 + (yy - ly)**2)
                 lobe = np.exp(-(d ** 2) / (2 * lobe_size ** 2))
                 density += lobe * 0.6
@@ -190,11 +295,11 @@ class NebulaRenderer:
         Renderizza supernova remnant
         Struttura filiforme e caotica
         """
-        rng = rng_from_seed(hash_u64(obj.id, 0x5NR))
+        rng = rng_from_seed(hash_u64(obj.id, 0x5E7))
         
-        density = np.zeros((size, size), dtype=np.float32)
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
         
-        yy, xx = np.mgrid[0:size, 0:size]
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
         # Shell principale espanso
@@ -206,24 +311,16 @@ class NebulaRenderer:
         # Shell con turbolenza
         shell = np.exp(-((r - r_shell) ** 2) / (2 * thickness ** 2))
         
-        # Aggiungi filamenti radiali (caratteristici SNR)
+        # Aggiungi filamenti radiali (caratteristici SNR): parametri
+        # estratti nello stesso ordine di sempre, poi un solo kernel
         n_filaments = rng.integers(15, 30)
-        for _ in range(n_filaments):
-            angle = rng.uniform(0, 2 * np.pi)
-            r_start = rng.uniform(r_shell * 0.8, r_shell * 1.2)
-            length = rng.uniform(0.1, 0.3) * size
-            width = rng.uniform(1, 3)
-            
-            # Filamento radiale
-            dx_fil = (xx - cx) - r_start * np.cos(angle)
-            dy_fil = (yy - cy) - r_start * np.sin(angle)
-            
-            # Distanza dal raggio
-            d_perp = abs(dx_fil * np.sin(angle) - dy_fil * np.cos(angle))
-            d_along = dx_fil * np.cos(angle) + dy_fil * np.sin(angle)
-            
-            fil_mask = (d_along > 0) & (d_along < length) & (d_perp < width)
-            density[fil_mask] += rng.uniform(0.3, 0.7)
+        fil = np.array([(rng.uniform(0, 2 * np.pi),
+                         rng.uniform(r_shell * 0.8, r_shell * 1.2),
+                         rng.uniform(0.1, 0.3) * size,
+                         rng.uniform(1, 3),
+                         rng.uniform(0.3, 0.7)) for _ in range(n_filaments)])
+        add_snr_filaments(density, cx, cy, fil[:, 0], fil[:, 1], fil[:, 2],
+                          fil[:, 3], fil[:, 4])
         
         density += shell
         density = np.clip(density, 0, 1)
@@ -237,18 +334,16 @@ class NebulaRenderer:
         Renderizza nebulosa a riflessione
         Più smooth e bluastra
         """
-        rng = rng_from_seed(hash_u64(obj.id, 0xR3F1))
+        rng = rng_from_seed(hash_u64(obj.id, 0xAEF1))
         
-        density = np.zeros((size, size), dtype=np.float32)
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
         
-        yy, xx = np.mgrid[0:size, 0:size]
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
-        # Distribuzione smooth
+        # Distribuzione smooth (copia: il profilo in cache è sola lettura)
         r_max = size * 0.4
-        r = np.sqrt((xx - cx)**2 + (yy - cy)**2)
-        
-        density = np.exp(-(r ** 2) / (2 * r_max ** 2))
+        density = _radial_gaussian(size, 0.4).copy()
         
         # Aggiungi variazioni locali
         n_clouds = rng.integers(3, 8)
@@ -270,14 +365,7 @@ class NebulaRenderer:
     
     def _render_generic(self, obj: DeepSkyObject, size: int) -> pygame.Surface:
         """Rendering generico per oggetti sconosciuti"""
-        density = np.zeros((size, size), dtype=np.float32)
-        
-        yy, xx = np.mgrid[0:size, 0:size]
-        cx, cy = size / 2, size / 2
-        r = np.sqrt((xx - cx)**2 + (yy - cy)**2)
-        
-        r_max = size * 0.3
-        density = np.exp(-(r ** 2) / (2 * r_max ** 2))
+        density = _radial_gaussian(size, 0.3)
         
         return self._density_to_surface(density, "RGB", "GENERIC")
     
@@ -290,80 +378,11 @@ class NebulaRenderer:
             filter_mode: "RGB", "Ha", "OIII", "SII", ecc.
             obj_type: "HII", "PN", "SNR", "RN", ecc.
         """
-        h, w = density.shape
-        
-        # Palette colori per diversi filtri e tipi
-        if filter_mode == "Ha":
-            # H-alpha (rosso)
-            r = (density * 255).astype(np.uint8)
-            g = (density * 60).astype(np.uint8)
-            b = (density * 60).astype(np.uint8)
-        
-        elif filter_mode == "OIII":
-            # OIII (ciano-verde)
-            r = (density * 80).astype(np.uint8)
-            g = (density * 255).astype(np.uint8)
-            b = (density * 180).astype(np.uint8)
-        
-        elif filter_mode == "SII":
-            # SII (rosso scuro)
-            r = (density * 200).astype(np.uint8)
-            g = (density * 40).astype(np.uint8)
-            b = (density * 40).astype(np.uint8)
-        
-        elif filter_mode == "HOO":
-            # H-alpha + OIII (Hubble palette style)
-            r = (density * 255).astype(np.uint8)
-            g = (density * 180).astype(np.uint8)
-            b = (density * 120).astype(np.uint8)
-        
-        elif filter_mode == "SHO":
-            # Sulphur-Hydrogen-Oxygen (false color)
-            r = (density * 255).astype(np.uint8)
-            g = (density * 220).astype(np.uint8)
-            b = (density * 120).astype(np.uint8)
-        
-        else:  # RGB o default
-            if obj_type == "HII":
-                # HII regions - rosso-rosa
-                r = (density * 255).astype(np.uint8)
-                g = (density * 120).astype(np.uint8)
-                b = (density * 140).astype(np.uint8)
-            
-            elif obj_type == "PN":
-                # Planetarie - verde-blu
-                r = (density * 120).astype(np.uint8)
-                g = (density * 255).astype(np.uint8)
-                b = (density * 200).astype(np.uint8)
-            
-            elif obj_type == "SNR":
-                # SNR - mix rosso-verde
-                r = (density * 240).astype(np.uint8)
-                g = (density * 180).astype(np.uint8)
-                b = (density * 100).astype(np.uint8)
-            
-            elif obj_type == "RN":
-                # Riflessione - blu
-                r = (density * 120).astype(np.uint8)
-                g = (density * 160).astype(np.uint8)
-                b = (density * 255).astype(np.uint8)
-            
-            else:
-                # Default
-                gray = (density * 255).astype(np.uint8)
-                r = g = b = gray
-        
-        # Crea superficie RGBA
-        alpha = (density * 255).astype(np.uint8)
-        
-        # Stack RGB + A
-        rgba = np.stack([r, g, b, alpha], axis=-1)
-        
-        # Crea superficie pygame
-        surf = pygame.Surface((w, h), pygame.SRCALPHA)
-        pygame.surfarray.blit_array(surf, rgba.transpose(1, 0, 2))
-        
-        return surf
+        # Palette colori per diversi filtri e tipi (RGB o default: per tipo)
+        rgb = FILTER_PALETTE.get(filter_mode)
+        if rgb is None:
+            rgb = TYPE_PALETTE.get(obj_type, (255, 255, 255))
+        return density_to_rgba_surface(density, rgb)
 
 class GalaxyRenderer:
     """Renderer per galassie in stile pixelart"""
@@ -389,10 +408,10 @@ class GalaxyRenderer:
     
     def _render_spiral(self, obj: DeepSkyObject, size: int) -> pygame.Surface:
         """Galassia spirale con bracci"""
-        rng = rng_from_seed(hash_u64(obj.id, 0x5P1RA))
+        rng = rng_from_seed(hash_u64(obj.id, 0x5B1A))
         
-        density = np.zeros((size, size), dtype=np.float32)
-        yy, xx = np.mgrid[0:size, 0:size]
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
         # Bulge centrale
@@ -411,11 +430,11 @@ class GalaxyRenderer:
         pitch_angle = rng.uniform(10, 35)  # Gradi
         
         for arm_id in range(n_arms):
-            base_angle = (arm_id / n_arms) * 2 * np.pi
+            base_angle = (arm_id / int(n_arms)) * 2 * math.pi
             
             # Spirale logaritmica
             theta = np.arctan2(yy - cy, xx - cx)
-            r_spiral = r * np.exp(-np.tan(np.radians(pitch_angle)) * (theta - base_angle))
+            r_spiral = r * np.exp(-math.tan(math.radians(pitch_angle)) * (theta - base_angle))
             
             arm_width = size * 0.05
             arm_mask = np.exp(-((r - r_spiral) ** 2) / (2 * arm_width ** 2))
@@ -425,8 +444,8 @@ class GalaxyRenderer:
             for _ in range(n_hii):
                 hii_r = rng.uniform(bulge_r, disk_r)
                 hii_theta = rng.uniform(base_angle, base_angle + 2 * np.pi / n_arms)
-                hii_x = cx + hii_r * np.cos(hii_theta)
-                hii_y = cy + hii_r * np.sin(hii_theta)
+                hii_x = cx + hii_r * math.cos(hii_theta)
+                hii_y = cy + hii_r * math.sin(hii_theta)
                 hii_size = rng.uniform(1, 3)
                 
                 d_hii = np.sqrt((xx - hii_x)**2 + (yy - hii_y)**2)
@@ -443,8 +462,8 @@ class GalaxyRenderer:
     
     def _render_elliptical(self, obj: DeepSkyObject, size: int) -> pygame.Surface:
         """Galassia ellittica - smooth e simmetrica"""
-        density = np.zeros((size, size), dtype=np.float32)
-        yy, xx = np.mgrid[0:size, 0:size]
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
         # Profilo de Vaucouleurs (semplificato)
@@ -460,10 +479,10 @@ class GalaxyRenderer:
     
     def _render_irregular(self, obj: DeepSkyObject, size: int) -> pygame.Surface:
         """Galassia irregolare - caotica"""
-        rng = rng_from_seed(hash_u64(obj.id, 0x1RR36))
+        rng = rng_from_seed(hash_u64(obj.id, 0x1AA36))
         
-        density = np.zeros((size, size), dtype=np.float32)
-        yy, xx = np.mgrid[0:size, 0:size]
+        density = np.zeros((size, size), dtype=_DENSITY_DTYPE)
+        yy, xx = grid_axes(size)
         cx, cy = size / 2, size / 2
         
         # Più regioni di formazione stellare
@@ -499,15 +518,4 @@ class GalaxyRenderer:
             g_factor = 0.95
             b_factor = 1.0
         
-        r = (density * 255 * r_factor).astype(np.uint8)
-        g = (density * 255 * g_factor).astype(np.uint8)
-        b = (density * 255 * b_factor).astype(np.uint8)
-        alpha = (density * 255).astype(np.uint8)
-        
-        rgba = np.stack([r, g, b, alpha], axis=-1)
-        
-        h, w = density.shape
-        surf = pygame.Surface((w, h), pygame.SRCALPHA)
-        pygame.surfarray.blit_array(surf, rgba.transpose(1, 0, 2))
-        
-        return surf
+        return density_to_rgba_surface(density, (255 * r_factor, 255 * g_factor, 255 * b_factor))
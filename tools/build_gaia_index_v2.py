@@ -17,7 +17,7 @@ Input files:
       g_mag   (or: phot_g_mean_mag / mag_g)
       bp_rp
 
-Output NPZ (default: data/gaia_index_v2.npz):
+Output NPZ (default: data/gaia_index_v2.npz; uncompressed unless --compress):
   tile_keys:   int32  [Ntiles]   # key=(tri<<16)|(tdi&0xFFFF), tri=floor(ra/5), tdi=floor((dec+90)/5)
   tile_starts: int64  [Ntiles]
   tile_ends:   int64  [Ntiles]
@@ -44,63 +44,145 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import csv
 from pathlib import Path
 import glob
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pac
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
 TILE_DEG = 5.0
 
-def _tile_key(tri: np.ndarray, tdi: np.ndarray) -> np.int32:
-    # pack 2x 16-bit signed-ish indices into int32 (stable across platforms)
-    return np.int32(((tri.astype(np.int64) & 0xFFFF) << 16) | (tdi.astype(np.int64) & 0xFFFF))
+def _tile_key(tri: np.ndarray, tdi: np.ndarray) -> np.ndarray:
+    # pack 2x 16-bit signed-ish indices into int32 (stable across platforms);
+    # int32 throughout, the shift wraps to the same bits as the int64 packing
+    tri = tri.astype(np.int32, copy=False)
+    tdi = tdi.astype(np.int32, copy=False)
+    return ((tri & 0xFFFF) << 16) | (tdi & 0xFFFF)
+
+def _tile_index(x: np.ndarray, offset_deg: float = 0.0) -> np.ndarray:
+    # floor((x + offset) / TILE_DEG) as int32, in float32 without a float64 copy.
+    # offset is a whole number of tiles, added after the floor: exact, unlike
+    # rounding x + offset in float32 first
+    q = x / np.float32(TILE_DEG)
+    np.floor(q, out=q)
+    idx = q.astype(np.int32)
+    idx += int(round(offset_deg / TILE_DEG))
+    return idx
+
+def _tile_mag_order(keys: np.ndarray, mag_v: np.ndarray) -> np.ndarray:
+    # Same order as np.lexsort((mag_v, keys)) (stable), from one argsort of a
+    # packed uint64: biased tile key in the high half, mag_v bits made
+    # order-preserving as unsigned ints in the low half (finite mag_v only)
+    bits = (mag_v.astype(np.float32) + np.float32(0.0)).view(np.uint32)   # -0.0 -> +0.0
+    bits = np.where(bits & np.uint32(0x80000000), ~bits, bits | np.uint32(0x80000000))
+    packed = (keys.astype(np.int64) + (1 << 31)).astype(np.uint64) << np.uint64(32)
+    packed |= bits
+    return np.argsort(packed, kind="stable")
 
-def _pick_col(df: pd.DataFrame, *names: str) -> str | None:
-    cols = {c.lower().strip(): c for c in df.columns}
+def _pick_col(columns, *names: str) -> str | None:
+    cols = {c.lower().strip(): c for c in columns}
     for n in names:
         if n.lower() in cols:
             return cols[n.lower()]
     return None
 
+def _csv_header(path: Path) -> list[str]:
+    with open(path, newline="") as f:
+        return next(csv.reader(f), [])
+
+def _read_csv_arrow(path: Path, types: dict[str, np.dtype]) -> dict[str, np.ndarray]:
+    # Multi-threaded parse straight into typed Arrow columns (only the ones we use)
+    read_options = pac.ReadOptions(use_threads=True, block_size=1 << 22)
+    convert_options = pac.ConvertOptions(
+        column_types={c: pa.from_numpy_dtype(t) for c, t in types.items()},
+        include_columns=list(types),
+    )
+    tbl = pac.read_csv(path, read_options=read_options, convert_options=convert_options)
+    out = {}
+    for c, t in types.items():
+        col = tbl.column(c)
+        if np.dtype(t).kind == "i":
+            col = pc.fill_null(col, 0)   # missing ids -> 0 (floats: nulls -> NaN)
+        out[c] = col.to_numpy()
+    return out
+
+def _count_rows(path: Path) -> int:
+    # Upper bound on the data rows of one input file, without parsing it
+    if path.suffix.lower() in (".parquet", ".pq"):
+        if HAS_ARROW:
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(path).metadata.num_rows
+        return len(pd.read_parquet(path))
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 24):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1   # no trailing newline
+    return max(lines - 1, 0)   # header
+
 def _load_one(path: Path) -> dict[str, np.ndarray]:
+    df = None
     if path.suffix.lower() in (".parquet", ".pq"):
         df = pd.read_parquet(path)
-    else:
+    elif not HAS_ARROW:
         df = pd.read_csv(path)
+    columns = list(df.columns) if df is not None else _csv_header(path)
 
-    ra_c  = _pick_col(df, "ra", "ra_deg")
-    dec_c = _pick_col(df, "dec", "dec_deg")
-    v_c   = _pick_col(df, "v_sim", "mag_v", "v_mag")
+    ra_c  = _pick_col(columns, "ra", "ra_deg")
+    dec_c = _pick_col(columns, "dec", "dec_deg")
+    v_c   = _pick_col(columns, "v_sim", "mag_v", "v_mag")
     if ra_c is None or dec_c is None or v_c is None:
-        raise SystemExit(f"{path.name}: missing required columns. Need ra, dec, v_sim (or mag_v/v_mag). Found: {list(df.columns)[:20]} ...")
+        raise SystemExit(f"{path.name}: missing required columns. Need ra, dec, v_sim (or mag_v/v_mag). Found: {columns[:20]} ...")
 
-    g_c   = _pick_col(df, "g_mag", "phot_g_mean_mag", "mag_g")
-    c_c   = _pick_col(df, "bp_rp")
-    sid_c = _pick_col(df, "source_id")
+    g_c   = _pick_col(columns, "g_mag", "phot_g_mean_mag", "mag_g")
+    c_c   = _pick_col(columns, "bp_rp")
+    sid_c = _pick_col(columns, "source_id")
 
-    ra  = df[ra_c].to_numpy(dtype=np.float64)
-    dec = df[dec_c].to_numpy(dtype=np.float64)
-    mag_v = df[v_c].to_numpy(dtype=np.float32)
+    # Parsed straight to the output dtypes: no float64 copy of ra/dec to cast later
+    types = {ra_c: np.float32, dec_c: np.float32, v_c: np.float32}
+    for c, t in ((g_c, np.float32), (c_c, np.float32), (sid_c, np.int64)):
+        if c is not None:
+            types[c] = t
+    if df is None:
+        cols = _read_csv_arrow(path, types)
+    else:
+        cols = {c: df[c].to_numpy(dtype=t, copy=False) for c, t in types.items()}
+
+    ra  = cols[ra_c]
+    dec = cols[dec_c]
+    mag_v = cols[v_c]
 
-    mag_g = df[g_c].to_numpy(dtype=np.float32) if g_c is not None else np.full(mag_v.shape, np.nan, dtype=np.float32)
-    bp_rp = df[c_c].to_numpy(dtype=np.float32) if c_c is not None else np.full(mag_v.shape, np.nan, dtype=np.float32)
-    source_id = df[sid_c].to_numpy(dtype=np.int64) if sid_c is not None else np.zeros(mag_v.shape, dtype=np.int64)
+    mag_g = cols[g_c] if g_c is not None else np.full(mag_v.shape, np.nan, dtype=np.float32)
+    bp_rp = cols[c_c] if c_c is not None else np.full(mag_v.shape, np.nan, dtype=np.float32)
+    source_id = cols[sid_c] if sid_c is not None else np.zeros(mag_v.shape, dtype=np.int64)
 
     # Basic sanity filters
     m = np.isfinite(ra) & np.isfinite(dec) & np.isfinite(mag_v)
     if m.sum() != m.size:
         ra, dec, mag_v, mag_g, bp_rp, source_id = ra[m], dec[m], mag_v[m], mag_g[m], bp_rp[m], source_id[m]
 
-    # Normalize RA to [0,360)
-    ra %= 360.0
-    return dict(ra=ra.astype(np.float32), dec=dec.astype(np.float32), mag_v=mag_v.astype(np.float32),
-                mag_g=mag_g.astype(np.float32), bp_rp=bp_rp.astype(np.float32), source_id=source_id.astype(np.int64))
+    # Normalize RA to [0,360) in float32 (in place unless an Arrow column is a read-only view)
+    ra = np.mod(ra, np.float32(360.0), out=ra if ra.flags.writeable else None)
+    return dict(ra=ra, dec=dec, mag_v=mag_v, mag_g=mag_g, bp_rp=bp_rp, source_id=source_id)
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Input file path or glob (CSV/Parquet). Quote globs on Windows.")
     ap.add_argument("--output", default="data/gaia_index_v2.npz", help="Output NPZ path")
     ap.add_argument("--mag-limit", type=float, default=None, help="Optional additional cut on mag_v (V_sim)")
+    ap.add_argument("--compress", action="store_true",
+                    help="Write a zlib-compressed NPZ (smaller, much slower to write and load)")
     args = ap.parse_args()
 
     paths = [Path(p) for p in glob.glob(args.input)]
@@ -111,39 +193,43 @@ def main() -> None:
         else:
             raise SystemExit(f"No input files matched: {args.input}")
 
-    all_ra = []
-    all_dec = []
-    all_mag_v = []
-    all_mag_g = []
-    all_bp_rp = []
-    all_sid = []
+    paths = sorted(paths)
+    names = ("ra", "dec", "mag_v", "mag_g", "bp_rp", "source_id")
+    cols: dict[str, np.ndarray] = {}
+    if len(paths) > 1:
+        # Output columns allocated once from the (cheap) row counts and filled
+        # file by file: peak memory is the output plus one file, not twice the output
+        capacity = sum(_count_rows(p) for p in paths)
+        cols = {k: np.empty(capacity, dtype=np.int64 if k == "source_id" else np.float32) for k in names}
 
     total = 0
-    for p in sorted(paths):
+    for p in paths:
         data = _load_one(p)
-        ra, dec, mag_v, mag_g, bp_rp, sid = data["ra"], data["dec"], data["mag_v"], data["mag_g"], data["bp_rp"], data["source_id"]
         if args.mag_limit is not None:
-            mm = mag_v <= np.float32(args.mag_limit)
-            ra, dec, mag_v, mag_g, bp_rp, sid = ra[mm], dec[mm], mag_v[mm], mag_g[mm], bp_rp[mm], sid[mm]
+            mm = data["mag_v"] <= np.float32(args.mag_limit)
+            data = {k: data[k][mm] for k in names}
+        n = data["ra"].size
 
-        all_ra.append(ra); all_dec.append(dec); all_mag_v.append(mag_v); all_mag_g.append(mag_g); all_bp_rp.append(bp_rp); all_sid.append(sid)
-        total += ra.size
-        print(f"Loaded {p.name}: {ra.size:,} rows")
+        if len(paths) == 1:
+            cols = data
+        else:
+            if total + n > len(cols["ra"]):
+                # Row count was short (unusual line endings): grow
+                cols = {k: np.resize(a, total + n) for k, a in cols.items()}
+            for k in names:
+                cols[k][total:total + n] = data[k]
+        total += n
+        print(f"Loaded {p.name}: {n:,} rows")
 
-    ra = np.concatenate(all_ra) if len(all_ra) > 1 else all_ra[0]
-    dec = np.concatenate(all_dec) if len(all_dec) > 1 else all_dec[0]
-    mag_v = np.concatenate(all_mag_v) if len(all_mag_v) > 1 else all_mag_v[0]
-    mag_g = np.concatenate(all_mag_g) if len(all_mag_g) > 1 else all_mag_g[0]
-    bp_rp = np.concatenate(all_bp_rp) if len(all_bp_rp) > 1 else all_bp_rp[0]
-    source_id = np.concatenate(all_sid) if len(all_sid) > 1 else all_sid[0]
+    ra, dec, mag_v, mag_g, bp_rp, source_id = (cols[k][:total] for k in names)
 
     # Tile indices: RA 0..360 -> 0..71, Dec -90..+90 -> 0..35
-    tri = np.floor(ra.astype(np.float64) / TILE_DEG).astype(np.int64)
-    tdi = np.floor((dec.astype(np.float64) + 90.0) / TILE_DEG).astype(np.int64)
+    tri = _tile_index(ra)
+    tdi = _tile_index(dec, 90.0)
     keys = _tile_key(tri, tdi)
 
     # Sort by tile, then by visual magnitude (ascending)
-    order = np.lexsort((mag_v, keys))
+    order = _tile_mag_order(keys, mag_v)
     keys = keys[order]
     ra = ra[order].astype(np.float32, copy=False)
     dec = dec[order].astype(np.float32, copy=False)
@@ -160,7 +246,10 @@ def main() -> None:
     out = Path(args.output)
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    np.savez_compressed(
+    # Uncompressed by default: DEFLATE is single-threaded, dominates the build
+    # and gains little on float32 columns
+    save = np.savez_compressed if args.compress else np.savez
+    save(
         out,
         tile_keys=uniq.astype(np.int32),
         tile_starts=starts.astype(np.int64),
@@ -12,6 +12,8 @@ Query interface
   universe.get_all()                   → all visible objects
   universe.get_dso()                   → DSOs only (no stars)
   universe.get_stars()                 → stars only
+  universe.get_stars_soa()             → stars as parallel NumPy arrays
+  universe.get_dso_soa()               → DSO positions/mags as NumPy arrays
   universe.get_by_uid("M42")           → single object
   universe.query_cone(ra, dec, r_deg)  → objects within angular radius
   universe.query_class(ObjectClass.NEBULA) → by class
@@ -27,8 +29,13 @@ from __future__ import annotations
 import math
 from typing import List, Optional, Dict, Callable
 
+import numpy as np
+
 from .space_object import SpaceObject, ObjectClass, ObjectSubtype, ObjectOrigin, DiscoveryState
 
+# Height of the declination zones in the star SoA's spatial index
+STAR_ZONE_DEG = 1.0
+
 
 class Universe:
     """
@@ -45,6 +52,8 @@ class Universe:
         # Cached partitions (rebuilt when objects are added)
         self._stars: List[SpaceObject] = []
         self._dso:   List[SpaceObject] = []
+        self._stars_soa: Optional[Dict[str, np.ndarray]] = None
+        self._dso_soa:   Optional[Dict[str, np.ndarray]] = None
         self._dirty  = True
         
         # Procedural LOD system (disabled by default for now)
@@ -134,6 +143,8 @@ class Universe:
                        if o.obj_class == ObjectClass.STAR]
         self._dso   = [o for o in self._objects.values()
                        if o.obj_class != ObjectClass.STAR]
+        self._stars_soa = None
+        self._dso_soa = None
         self._dirty = False
 
     # -----------------------------------------------------------------------
@@ -150,6 +161,68 @@ class Universe:
         self._rebuild_cache()
         return self._stars
 
+    def get_stars_soa(self) -> Dict[str, np.ndarray]:
+        """
+        All real stars as parallel arrays (struct-of-arrays), same order
+        as get_stars(): 'ra', 'dec', 'mag', 'bv' (float64), plus 'xyz',
+        the (N, 3) equatorial unit vectors used for batched projection,
+        and a zone index for FOV queries: stars bucketed into STAR_ZONE_DEG
+        declination zones and sorted by RA inside each zone
+        ('zone_order' = star indices, 'zone_ra' = their RAs,
+        'zone_start' = offset of each zone, length n_zones + 1), so a
+        field's candidates are a couple of searchsorted calls per zone.
+        Lets renderers cull the catalogue with vector masks instead of
+        per-object attribute access. Rebuilt when objects are added.
+        """
+        self._rebuild_cache()
+        if self._stars_soa is None:
+            stars = self._stars
+            n = len(stars)
+            self._stars_soa = {
+                'ra':  np.fromiter((o.ra_deg for o in stars), np.float64, n),
+                'dec': np.fromiter((o.dec_deg for o in stars), np.float64, n),
+                'mag': np.fromiter((o.mag for o in stars), np.float64, n),
+                'bv':  np.fromiter((o.bv_color for o in stars), np.float64, n),
+            }
+            ra_r = np.radians(self._stars_soa['ra'])
+            dec_r = np.radians(self._stars_soa['dec'])
+            cos_dec = np.cos(dec_r)
+            self._stars_soa['xyz'] = np.stack(
+                [cos_dec * np.cos(ra_r), cos_dec * np.sin(ra_r), np.sin(dec_r)],
+                axis=1)
+            ra, dec = self._stars_soa['ra'], self._stars_soa['dec']
+            n_zones = int(math.ceil(180.0 / STAR_ZONE_DEG))
+            zone = np.clip(((dec + 90.0) // STAR_ZONE_DEG).astype(np.int64),
+                           0, n_zones - 1)
+            order = np.lexsort((ra, zone))
+            self._stars_soa['zone_order'] = order
+            self._stars_soa['zone_ra'] = ra[order]
+            self._stars_soa['zone_start'] = np.searchsorted(
+                zone[order], np.arange(n_zones + 1))
+        return self._stars_soa
+
+    def get_dso_soa(self) -> Dict[str, np.ndarray]:
+        """
+        All DSOs as parallel arrays, visible or not: 'ra', 'dec', 'mag'
+        (float64) and 'objects', an object array of the SpaceObjects in the
+        same order. Lets renderers cull by position and magnitude with
+        vector masks, then apply visibility rules to the survivors only.
+        Rebuilt when objects are added.
+        """
+        self._rebuild_cache()
+        if self._dso_soa is None:
+            dso = self._dso
+            n = len(dso)
+            objects = np.empty(n, dtype=object)
+            objects[:] = dso
+            self._dso_soa = {
+                'ra':  np.fromiter((o.ra_deg for o in dso), np.float64, n),
+                'dec': np.fromiter((o.dec_deg for o in dso), np.float64, n),
+                'mag': np.fromiter((o.mag for o in dso), np.float64, n),
+                'objects': objects,
+            }
+        return self._dso_soa
+
     def get_dso(self, include_unknown: bool = False) -> List[SpaceObject]:
         """All DSOs (non-stars), applying visibility rules"""
         self._rebuild_cache()